@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AiConfig(AppConfig):
     name = 'AI'
+
+    def ready(self):
+        from . import checks
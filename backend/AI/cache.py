@@ -0,0 +1,140 @@
+"""
+Response cache for LLM-backed chat turns.
+
+Many students open with the same message and an empty state ("book laundry",
+"what services are there"), so completions are cached per process under a
+normalized (message, state, date) key, with a TTL and LRU eviction.
+Concurrent identical requests are coalesced: the first one calls the LLM and
+the others await its result instead of starting their own completion.
+"""
+import asyncio
+import json
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date
+
+from .intents import RESPONSE_FIELDS
+from .llm import llm_setting
+
+# State fields that change what the model answers; the previous reply text
+# and the always-false flags do not.
+KEY_FIELDS = [field for field in RESPONSE_FIELDS if field not in ('response', 'booked', 'completed_service')]
+
+
+def cache_key(user_message, previous_state, today=None):
+    message = ' '.join(user_message.lower().split())
+    state = previous_state if isinstance(previous_state, dict) else {}
+    state = {field: state[field] for field in KEY_FIELDS if state.get(field)}
+    # Relative dates ("tomorrow") resolve differently each day
+    today = (today or date.today()).isoformat()
+    return json.dumps([message, state, today], sort_keys=True, ensure_ascii=False, default=str)
+
+
+class ChatResponseCache:
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, response, upstream seconds)
+        self.inflight = weakref.WeakKeyDictionary()  # event loop -> {key: future}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.evictions = 0
+        self.upstream_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key, response, seconds):
+        self.entries[key] = (time.monotonic() + self.ttl, response, seconds)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    async def get_or_compute(self, key, compute):
+        """
+        Return (response, outcome) where outcome is 'hit', 'coalesced' or
+        'miss'. `compute` is an async callable returning the response dict, or
+        None on failure; failures are shared with coalesced callers but never
+        cached. Responses are copied, so callers may modify what they get.
+        """
+        response = self.lookup(key)
+        if response is not None:
+            return response, 'hit'
+
+        inflight = self.inflight.setdefault(asyncio.get_running_loop(), {})
+        future = inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            started = time.monotonic()
+            response, seconds = await asyncio.shield(future)
+            # The wait for the shared call is time this caller still spent
+            self.saved_seconds += max(0.0, seconds - (time.monotonic() - started))
+            return (dict(response) if response is not None else None), 'coalesced'
+
+        future = inflight[key] = asyncio.get_running_loop().create_future()
+        started = time.monotonic()
+        response = None
+        try:
+            response = await compute()
+        finally:
+            seconds = time.monotonic() - started
+            del inflight[key]
+            # Also resolves waiters when the leading request is cancelled
+            future.set_result((response, seconds))
+            self.store(key, response, seconds)
+        return (dict(response) if response is not None else None), 'miss'
+
+    def lookup(self, key):
+        """Cached response for `key` (a copy), or None; counts the hit."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        self.saved_seconds += entry[2]
+        return dict(entry[1])
+
+    def store(self, key, response, seconds):
+        """Record an upstream call that took `seconds`; cache it unless it failed."""
+        self.misses += 1
+        self.upstream_seconds += seconds
+        if response is not None:
+            self.set(key, response, seconds)
+
+    def stats(self):
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'lookups': lookups,
+            'hits': self.hits,
+            'coalesced': self.coalesced,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            'upstream_ms': round(self.upstream_seconds * 1000, 1),
+            'latency_saved_ms': round(self.saved_seconds * 1000, 1),
+        }
+
+
+response_cache = ChatResponseCache(
+    max_entries=llm_setting('CACHE_MAX_ENTRIES'),
+    ttl=llm_setting('CACHE_TTL'),
+)
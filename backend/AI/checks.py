@@ -0,0 +1,17 @@
+from django.core.checks import Warning, register
+from django.utils.module_loading import import_string
+
+from .llm import MISSING_API_KEY, OpenAIBackend, llm_setting
+
+
+@register()
+def check_llm_api_key(app_configs, **kwargs):
+    """
+    The OpenAI-compatible backend needs an API key; there is no default. A
+    warning rather than an error, so migrations and the offline tooling still
+    run without one; the backend itself raises ImproperlyConfigured on use.
+    """
+    backend = import_string(llm_setting('BACKEND'))
+    if issubclass(backend, OpenAIBackend) and not llm_setting('API_KEY'):
+        return [Warning(MISSING_API_KEY, id='AI.W001')]
+    return []
@@ -0,0 +1,268 @@
+"""
+Deterministic intent and slot extraction for the booking assistant.
+
+Handles the common turns ("book laundry tomorrow 10am", "next Monday",
+"what services are there") locally; chat_with_ai only calls the LLM when the
+confidence of this parse is below FAST_PATH_THRESHOLD.
+"""
+import re
+from datetime import datetime, timedelta
+
+from api.models import Booking, Service
+from api.service_names import service_names as name_index
+
+FAST_PATH_THRESHOLD = 0.6
+
+RESPONSE_FIELDS = ["response", "intent", "serviceType", "date", "time", "instructions", "booked", "completed_service"]
+
+TIME_SLOTS = [slot for slot, _ in Booking.SERVICE_TIMES]
+
+INTENT_KEYWORDS = [
+    ('cancel', ('cancel', 'call off')),
+    ('reschedule', ('reschedule', 'move my', 'change my', 'postpone')),
+    ('info', ('what services', 'which services', 'list services', 'services are there')),
+    ('book', ('book', 'schedule', 'reserve', 'need', 'want', 'get my', "i'd like", 'appointment')),
+]
+
+# Answered from Service.price when the service is known
+PRICE_KEYWORDS = ('how much', 'price', 'cost', 'charge')
+
+GREETINGS = {'hi', 'hello', 'hey', 'hii', 'good morning', 'good afternoon', 'good evening'}
+
+# Words that point at a service whose name does not contain them
+SERVICE_KEYWORDS = {
+    'laundry': ('laundry', 'wash', 'clothes', 'ironing'),
+    'room cleaning': ('cleaning', 'clean my room', 'clean room', 'housekeeping', 'sweep'),
+    'study spaces': ('study', 'library', 'reading room'),
+    'tech support': ('tech', 'wifi', 'wi-fi', 'internet', 'laptop', 'computer'),
+    'room repairs': ('repair', 'fix', 'broken', 'maintenance', 'leak'),
+}
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december']
+
+ISO_DATE = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+DAY_MONTH = re.compile(r'\b(\d{1,2})(?:st|nd|rd|th)?\s+(' + '|'.join(m[:3] for m in MONTHS) + r')[a-z]*\b')
+MONTH_DAY = re.compile(r'\b(' + '|'.join(m[:3] for m in MONTHS) + r')[a-z]*\s+(\d{1,2})(?:st|nd|rd|th)?\b')
+IN_DAYS = re.compile(r'\bin (\d{1,2}) days?\b')
+WEEKDAY = re.compile(r'\b(?:(next|this|on|coming)\s+)?(' + '|'.join(WEEKDAYS) + r')\b')
+SLOT = re.compile(r'\b(\d{1,2})(?::00)?\s*(?:-|to)\s*(\d{1,2})(?::00)?\b')
+CLOCK = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?(?=\s|$|[,.!?])')
+INSTRUCTIONS = re.compile(r'\b(?:instructions?|note|notes)\s*[:\-]\s*(.+)$', re.IGNORECASE)
+
+
+def resolve_date(text, today):
+    if 'day after tomorrow' in text:
+        return today + timedelta(days=2)
+    if 'tomorrow' in text:
+        return today + timedelta(days=1)
+    if 'today' in text or 'tonight' in text:
+        return today
+
+    match = IN_DAYS.search(text)
+    if match:
+        return today + timedelta(days=int(match.group(1)))
+
+    match = ISO_DATE.search(text)
+    if match:
+        try:
+            return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))).date()
+        except ValueError:
+            return None
+
+    match = DAY_MONTH.search(text) or MONTH_DAY.search(text)
+    if match:
+        first, second = match.groups()
+        day, month = (first, second) if first.isdigit() else (second, first)
+        month_index = [m[:3] for m in MONTHS].index(month[:3]) + 1
+        try:
+            resolved = datetime(today.year, month_index, int(day)).date()
+        except ValueError:
+            return None
+        # "July 3" said in August means next year's
+        return resolved if resolved >= today else resolved.replace(year=today.year + 1)
+
+    match = WEEKDAY.search(text)
+    if match:
+        ahead = (WEEKDAYS.index(match.group(2)) - today.weekday()) % 7
+        if ahead == 0 and match.group(1) in ('next', 'coming', None, 'on'):
+            ahead = 7
+        return today + timedelta(days=ahead)
+    return None
+
+
+def slot_for_hour(hour):
+    for slot in TIME_SLOTS:
+        start, end = (int(part.split(':')[0]) for part in slot.split('-'))
+        if start <= hour < end:
+            return slot
+    return None
+
+
+def is_clock_time(text, match):
+    """Whether a CLOCK match is a time: "3pm", "3:00" or "at 3", but not "2 shirts"."""
+    _, minutes, meridiem = match.groups()
+    return bool(minutes or meridiem) or text[:match.start()].endswith('at ')
+
+
+def mentions_time(text):
+    """Whether `text` names a clock time, whether or not it is one of the slots."""
+    return bool(SLOT.search(text)) or any(is_clock_time(text, match) for match in CLOCK.finditer(text))
+
+
+def resolve_time(text):
+    match = SLOT.search(text)
+    if match:
+        start, end = int(match.group(1)), int(match.group(2))
+        if 1 <= start <= 7:
+            start, end = start + 12, end + 12
+        if end < start:
+            end += 12  # "12-2"
+        slot = f'{start:02d}:00-{end % 24:02d}:00'
+        if slot in TIME_SLOTS:
+            return slot
+
+    for match in CLOCK.finditer(text):
+        if not is_clock_time(text, match):
+            continue
+        hour, _, meridiem = match.groups()
+        hour = int(hour)
+        if meridiem and meridiem.startswith('p') and hour < 12:
+            hour += 12
+        elif meridiem and meridiem.startswith('a') and hour == 12:
+            hour = 0
+        elif meridiem is None and 1 <= hour <= 7:
+            hour += 12  # "at 3" in a booking chat means the afternoon
+        slot = slot_for_hour(hour)
+        if slot:
+            return slot
+
+    if 'noon' in text:
+        return slot_for_hour(12)
+    if 'early morning' in text:
+        return slot_for_hour(8)
+    if 'morning' in text:
+        return slot_for_hour(10)
+    if 'afternoon' in text:
+        return slot_for_hour(14)
+    if 'evening' in text:
+        return slot_for_hour(16)
+    return None
+
+
+def resolve_service(text, service_names):
+    """
+    Match `text` against the services in the Service table. Returns the
+    service name lowercased, which is what the by-name lookup expects.
+    """
+    for name in sorted(service_names, key=len, reverse=True):
+        lowered = name.lower()
+        if lowered and (lowered in text or lowered.rstrip('s') in text):
+            return lowered
+    known = {name.lower() for name in service_names}
+    for service, keywords in SERVICE_KEYWORDS.items():
+        if service in known and any(keyword in text for keyword in keywords):
+            return service
+    return None
+
+
+def resolve_intent(text):
+    for intent, keywords in INTENT_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return intent
+    return None
+
+
+def service_price(service):
+    """(name, price) of the service resolve_service() returned, or None."""
+    return Service.objects.filter(id=name_index.resolve(service)).values_list('name', 'price').first()
+
+
+def build_response(state, service_names):
+    service = state['serviceType']
+    if state['intent'] == 'info':
+        return 'We offer: ' + ', '.join(sorted(service_names)) + '. Which one would you like to book?'
+    if not service:
+        return 'Which service would you like to book? We offer: ' + ', '.join(sorted(service_names)) + '.'
+    if not state['date']:
+        return f'What date would you like to book {service} for?'
+    if not state['time']:
+        return f'Which time slot works for you on {state["date"]}? Options: ' + ', '.join(TIME_SLOTS) + '.'
+    return f'Booking {service} on {state["date"]} at {state["time"]}.'
+
+
+def extract_turn(user_message, previous_state, today=None):
+    """
+    Parse one chat turn on top of `previous_state`.
+    Returns (response dict in the chat_with_ai schema, confidence 0..1).
+    """
+    today = today or datetime.now().date()
+    text = ' '.join(user_message.lower().split())
+    previous_state = previous_state if isinstance(previous_state, dict) else {}
+    service_names = name_index.names()
+
+    state = {field: previous_state.get(field) for field in RESPONSE_FIELDS}
+    state['completed_service'] = False
+
+    if text.strip('!. ') in GREETINGS:
+        state['response'] = 'Hello! I can book ' + ', '.join(sorted(service_names)) + '. What do you need?'
+        state['intent'] = state['intent'] or 'other'
+        state['booked'] = bool(state['date'] and state['time'])
+        return state, 1.0
+
+    intent = resolve_intent(text)
+    service = resolve_service(text, service_names)
+    if intent in (None, 'info') and any(keyword in text for keyword in PRICE_KEYWORDS):
+        # A price question about this turn's service, or the one being booked
+        asked = service or state['serviceType']
+        priced = service_price(asked) if asked else None
+        if priced is None:
+            return state, 0.0  # leave it to the LLM
+        state['serviceType'] = asked
+        state['intent'] = 'info'
+        state['booked'] = bool(state['date'] and state['time'])
+        state['response'] = f'{priced[0]} costs ₹{priced[1]}. Would you like to book it?'
+        return state, 1.0
+    day = resolve_date(text, today)
+    time_text = ISO_DATE.sub(' ', text)
+    time_slot = resolve_time(time_text)
+    past_day = None
+    if day and day < today:
+        # An explicit date that has gone by ("2025-07-20"): never book it
+        past_day, day = day, None
+        state['date'] = None
+
+    confidence = 0.0
+    if intent:
+        confidence += 0.4
+        state['intent'] = intent
+    elif service or day or past_day or time_slot:
+        # A bare "tomorrow" or "laundry" continues (or starts) a booking
+        confidence += 0.4
+        state['intent'] = 'book'
+
+    for field, value in (('serviceType', service), ('date', day and day.isoformat()), ('time', time_slot)):
+        if value:
+            state[field] = value
+            confidence += 0.2
+
+    match = INSTRUCTIONS.search(user_message)
+    if match:
+        state['instructions'] = match.group(1).strip()
+
+    if intent == 'info':
+        confidence = 1.0
+    elif intent in ('cancel', 'reschedule'):
+        confidence = 0.0  # needs the booking history; leave to the LLM
+    elif past_day:
+        confidence = max(confidence, FAST_PATH_THRESHOLD)  # the answer is to ask for another date
+    elif not time_slot and mentions_time(time_text):
+        # A time outside the slots ("6pm") or one we could not place; don't ask again as if none was given
+        confidence = min(confidence, FAST_PATH_THRESHOLD / 2)
+
+    state['booked'] = bool(state['date'] and state['time'])
+    state['response'] = build_response(state, service_names)
+    if past_day:
+        state['response'] = f'{past_day.isoformat()} has already passed. ' + state['response']
+    return state, min(confidence, 1.0)
@@ -0,0 +1,139 @@
+"""
+Shared async LLM client for the booking assistant.
+
+The backend is chosen by AI_LLM['BACKEND'] (a dotted path): OpenAIBackend
+talks to any OpenAI-compatible API, AI.stub.StubBackend replays recorded
+completions offline. One backend instance (and its connection pool) is kept
+per event loop, so under the ASGI server every request reuses the same
+pooled connections. Each call is bounded by a timeout and by a per-loop
+semaphore that caps how many completions run upstream at once.
+"""
+import asyncio
+import weakref
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from openai import AsyncOpenAI
+
+LLM_DEFAULTS = {
+    'BACKEND': 'AI.llm.OpenAIBackend',
+    'BASE_URL': 'https://openrouter.ai/api/v1',
+    'API_KEY': '',
+    'MODEL': 'mistralai/mistral-7b-instruct:free',
+    'TEMPERATURE': 0.3,
+    'TIMEOUT': 20,
+    'MAX_CONCURRENCY': 8,
+    'CACHE_TTL': 600,
+    'CACHE_MAX_ENTRIES': 1000,
+    'SESSION_TTL': 3600,
+    'SESSION_CACHE': 'default',
+    'STUB': {},
+}
+
+SYSTEM_PROMPT = "You are a helpful assistant to book hostel services."
+
+
+MISSING_API_KEY = (
+    "AI_LLM['API_KEY'] is empty: set the OPEN_ROUTER_API_KEY environment variable, "
+    "or AI_LLM_BACKEND=AI.stub.StubBackend to run the assistant offline."
+)
+
+
+class LLMBusy(Exception):
+    """Raised when no upstream slot frees up within the call timeout."""
+
+
+def llm_setting(name):
+    return getattr(settings, 'AI_LLM', {}).get(name, LLM_DEFAULTS[name])
+
+
+class OpenAIBackend:
+    def __init__(self):
+        if not llm_setting('API_KEY'):
+            raise ImproperlyConfigured(MISSING_API_KEY)
+        self.client = AsyncOpenAI(
+            base_url=llm_setting('BASE_URL'),
+            api_key=llm_setting('API_KEY'),
+            timeout=llm_setting('TIMEOUT'),
+            max_retries=0,
+        )
+
+    async def complete(self, messages):
+        completion = await self.client.chat.completions.create(
+            model=llm_setting('MODEL'),
+            messages=messages,
+            temperature=llm_setting('TEMPERATURE'),
+        )
+        return completion.choices[0].message.content
+
+    async def stream(self, messages):
+        chunks = await self.client.chat.completions.create(
+            model=llm_setting('MODEL'),
+            messages=messages,
+            temperature=llm_setting('TEMPERATURE'),
+            stream=True,
+        )
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+_resources = weakref.WeakKeyDictionary()
+
+
+def get_resources():
+    loop = asyncio.get_running_loop()
+    resources = _resources.get(loop)
+    if resources is None:
+        backend = import_string(llm_setting('BACKEND'))()
+        resources = _resources[loop] = (backend, asyncio.Semaphore(llm_setting('MAX_CONCURRENCY')))
+    return resources
+
+
+def build_messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+async def acquire(semaphore, timeout):
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise LLMBusy('Too many concurrent LLM requests')
+
+
+async def complete(prompt):
+    """Return the full completion text for `prompt`."""
+    backend, semaphore = get_resources()
+    timeout = llm_setting('TIMEOUT')
+    await acquire(semaphore, timeout)
+    try:
+        text = await asyncio.wait_for(backend.complete(build_messages(prompt)), timeout)
+    finally:
+        semaphore.release()
+    return text.strip()
+
+
+async def stream(prompt):
+    """Yield completion text deltas for `prompt` as they arrive."""
+    backend, semaphore = get_resources()
+    timeout = llm_setting('TIMEOUT')
+    await acquire(semaphore, timeout)
+    iterator = backend.stream(build_messages(prompt)).__aiter__()
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                delta = await asyncio.wait_for(iterator.__anext__(), remaining)
+            except StopAsyncIteration:
+                break
+            yield delta
+    finally:
+        semaphore.release()
+        await iterator.aclose()
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.test.utils import override_settings
+
+from AI.cache import response_cache
+from AI.llm import LLM_DEFAULTS
+from AI.stub import STUB_DEFAULTS
+from api.benchmarks import percentile
+
+CHAT_PATH = '/ai/chat/'
+
+# A mix of turns the local parser answers and turns that need the LLM
+DEFAULT_MESSAGES = [
+    'book laundry tomorrow at 10am',
+    'hmm whenever my roommate is free',
+    'what services are there',
+    'my laptop is really slow',
+    'can we do it on the weekend',
+    'I want room cleaning next monday',
+    'there is a weird smell in my room',
+    'I need to cancel something',
+]
+
+
+class Command(BaseCommand):
+    help = ('Drive /ai/chat/ at a fixed concurrency and report latency percentiles and error rate. '
+            'By default runs in-process against the offline LLM stub; --url targets a running server.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--url', default=None, help='Base URL of a running server, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--messages', default=None, help='JSON list of user messages to cycle through.')
+        parser.add_argument('--unique', action='store_true',
+                            help='Make every message distinct so the response cache never hits.')
+        parser.add_argument('--latency-ms', type=float, default=STUB_DEFAULTS['LATENCY_MS'],
+                            help='In-process stub latency.')
+        parser.add_argument('--jitter-ms', type=float, default=STUB_DEFAULTS['JITTER_MS'])
+        parser.add_argument('--failure-rate', type=float, default=STUB_DEFAULTS['FAILURE_RATE'])
+        parser.add_argument('--max-concurrency', type=int, default=LLM_DEFAULTS['MAX_CONCURRENCY'],
+                            help='In-process cap on concurrent upstream calls.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive')
+        messages = DEFAULT_MESSAGES
+        if options['messages']:
+            with open(options['messages'], encoding='utf-8') as f:
+                messages = json.load(f)
+        bodies = []
+        for i in range(options['requests']):
+            message = messages[i % len(messages)]
+            if options['unique']:
+                message = f'{message} ({i})'
+            bodies.append(json.dumps({'user_message': message}))
+
+        if options['url']:
+            results, elapsed = asyncio.run(self.run_remote(options['url'], bodies, options['concurrency']))
+        else:
+            from django.conf import settings
+            llm_settings = dict(
+                getattr(settings, 'AI_LLM', {}),
+                BACKEND='AI.stub.StubBackend',
+                MAX_CONCURRENCY=options['max_concurrency'],
+                STUB={
+                    'LATENCY_MS': options['latency_ms'],
+                    'JITTER_MS': options['jitter_ms'],
+                    'FAILURE_RATE': options['failure_rate'],
+                },
+            )
+            response_cache.clear()
+            response_cache.reset_stats()
+            with override_settings(AI_LLM=llm_settings):
+                results, elapsed = asyncio.run(self.run_local(bodies, options['concurrency']))
+        self.report(results, elapsed, options['concurrency'])
+
+    async def drive(self, send, bodies, concurrency):
+        results = []
+        pending = iter(bodies)
+
+        async def worker():
+            for body in pending:
+                started = time.perf_counter()
+                try:
+                    status, outcome = await send(body)
+                except Exception as e:
+                    status, outcome = None, type(e).__name__
+                results.append((time.perf_counter() - started, status, outcome))
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        return results, time.perf_counter() - started
+
+    async def run_local(self, bodies, concurrency):
+        client = AsyncClient()
+
+        async def send(body):
+            response = await client.post(CHAT_PATH, body, content_type='application/json')
+            return response.status_code, response.get('X-Chat-Cache', '-')
+
+        return await self.drive(send, bodies, concurrency)
+
+    async def run_remote(self, base_url, bodies, concurrency):
+        url = base_url.rstrip('/') + CHAT_PATH
+        loop = asyncio.get_running_loop()
+
+        def post(body):
+            request = urllib.request.Request(url, data=body.encode(), headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                    return response.status, response.headers.get('X-Chat-Cache', '-')
+            except urllib.error.HTTPError as e:
+                return e.code, e.headers.get('X-Chat-Cache', '-')
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            async def send(body):
+                return await loop.run_in_executor(pool, post, body)
+            return await self.drive(send, bodies, concurrency)
+
+    def report(self, results, elapsed, concurrency):
+        latencies = sorted(seconds * 1000 for seconds, _, _ in results)
+        errors = sum(1 for _, status, _ in results if status != 200)
+        outcomes = Counter(outcome for _, _, outcome in results)
+        self.stdout.write(f'{len(results)} requests at concurrency {concurrency} in {elapsed:.2f}s '
+                          f'({len(results) / elapsed:.1f} req/s)')
+        self.stdout.write(f'latency ms  p50 {percentile(latencies, 50):.1f}  p95 {percentile(latencies, 95):.1f}  '
+                          f'p99 {percentile(latencies, 99):.1f}  max {latencies[-1]:.1f}')
+        self.stdout.write(f'errors {errors} ({errors / len(results):.1%})')
+        self.stdout.write('outcomes ' + ', '.join(f'{name} {count}' for name, count in sorted(outcomes.items())))
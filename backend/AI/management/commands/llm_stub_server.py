@@ -0,0 +1,103 @@
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from AI.stub import STUB_DEFAULTS, StubFailure, StubLLM
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible POST .../chat/completions, streaming or not."""
+    stub = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            messages = request['messages']
+        except (ValueError, KeyError, TypeError):
+            return self.send_json(400, {'error': {'message': 'Invalid request body'}})
+        if not self.path.rstrip('/').endswith('chat/completions'):
+            return self.send_json(404, {'error': {'message': 'Not found'}})
+
+        time.sleep(self.stub.delay())
+        if self.stub.fails():
+            return self.send_json(500, {'error': {'message': 'Simulated upstream failure'}})
+        try:
+            text = self.stub.reply(messages)
+        except StubFailure as e:
+            return self.send_json(500, {'error': {'message': str(e)}})
+
+        completion_id = 'chatcmpl-' + uuid.uuid4().hex
+        base = {'id': completion_id, 'created': int(time.time()), 'model': request.get('model', 'stub')}
+        if not request.get('stream'):
+            return self.send_json(200, dict(
+                base,
+                object='chat.completion',
+                choices=[{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+                usage={'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+            ))
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        pieces = self.stub.pieces(text)
+        for i, piece in enumerate(pieces):
+            chunk = dict(base, object='chat.completion.chunk', choices=[{
+                'index': 0,
+                'delta': {'role': 'assistant', 'content': piece} if i == 0 else {'content': piece},
+                'finish_reason': 'stop' if i == len(pieces) - 1 else None,
+            }])
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+            self.wfile.flush()
+        self.wfile.write(b'data: [DONE]\n\n')
+
+
+class Command(BaseCommand):
+    help = ('Serve recorded LLM completions over an OpenAI-compatible API, with simulated latency and '
+            'failures. Point AI_LLM BASE_URL at it to run the chat offline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency-ms', type=float, default=STUB_DEFAULTS['LATENCY_MS'])
+        parser.add_argument('--jitter-ms', type=float, default=STUB_DEFAULTS['JITTER_MS'])
+        parser.add_argument('--failure-rate', type=float, default=STUB_DEFAULTS['FAILURE_RATE'],
+                            help='Fraction of requests answered with HTTP 500.')
+        parser.add_argument('--completions', default=STUB_DEFAULTS['COMPLETIONS'],
+                            help='JSON list of {"match", "completion"} recordings.')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        StubHandler.stub = StubLLM(
+            completions=options['completions'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            failure_rate=options['failure_rate'],
+            seed=options['seed'],
+        )
+        server = ThreadingHTTPServer((options['host'], options['port']), StubHandler)
+        server.daemon_threads = True
+        self.stdout.write(f"LLM stub listening on http://{options['host']}:{options['port']}/v1")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,63 @@
+"""
+Server-side chat state, kept per conversation id in the cache named by
+AI_LLM['SESSION_CACHE'].
+
+Each turn is merged into the stored state, a handful of short fields, so the
+prompt does not grow as the conversation goes on. The client sends its own
+copy of the state as `previous_state` along with `conversation_id`; it is
+only used when the server has no state for that id (expired, restarted, or
+a per-process cache on another worker), and the conversation carries on
+from it. Point SESSION_CACHE at a shared cache to avoid the fallback.
+"""
+import uuid
+
+from django.core.cache import caches
+
+from .intents import RESPONSE_FIELDS
+from .llm import llm_setting
+
+SESSION_KEY = 'ai:chat-session:{}'
+
+# Everything in a reply except the reply text itself
+STATE_FIELDS = [field for field in RESPONSE_FIELDS if field != 'response']
+
+
+def get_session_cache():
+    return caches[llm_setting('SESSION_CACHE')]
+
+
+def new_conversation_id():
+    return uuid.uuid4().hex
+
+
+def clean_state(state):
+    state = state if isinstance(state, dict) else {}
+    return {field: state[field] for field in STATE_FIELDS if state.get(field) not in (None, '')}
+
+
+def load_state(conversation_id):
+    """The stored state of `conversation_id`, or None if unknown/expired."""
+    return get_session_cache().get(SESSION_KEY.format(conversation_id))
+
+
+def diff_state(old, new):
+    """Fields of `new` whose value differs from `old`; cleared fields map to None."""
+    new = clean_state(new)
+    return {field: new.get(field) for field in STATE_FIELDS if new.get(field) != old.get(field)}
+
+
+def apply_diff(conversation_id, state, changes):
+    """
+    Fold `changes` into `state`, store the merged state and return it. A turn
+    that changes nothing only refreshes the expiry.
+    """
+    key, timeout = SESSION_KEY.format(conversation_id), llm_setting('SESSION_TTL')
+    state = dict(state)
+    for field, value in changes.items():
+        if value is None:
+            state.pop(field, None)
+        else:
+            state[field] = value
+    if changes or not get_session_cache().touch(key, timeout):
+        get_session_cache().set(key, state, timeout)
+    return state
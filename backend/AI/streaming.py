@@ -0,0 +1,169 @@
+"""
+Streaming variant of chat_with_ai, served directly by the ASGI application
+(see backend/asgi.py):
+
+    POST /ai/chat/stream/  {"user_message": "...", "conversation_id": "...", "previous_state": {...}}
+
+The reply is a server-sent event stream: `delta` events carry the assistant's
+"response" text as the LLM produces it, and a final `result` event carries
+the complete object in the same schema as /ai/chat/.
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+
+from asgiref.sync import sync_to_async
+
+from . import llm
+from .cache import cache_key, response_cache
+from .intents import extract_turn, FAST_PATH_THRESHOLD
+from .views import (
+    FALLBACK_RESPONSE, build_prompt, load_conversation, parse_completion, read_chat_request, save_turn,
+)
+
+logger = logging.getLogger(__name__)
+
+CHAT_STREAM_PATH = '/ai/chat/stream/'
+
+JSON_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', b'authorization, content-type'),
+    (b'access-control-allow-methods', b'POST, OPTIONS'),
+]
+
+
+class ResponseTextExtractor:
+    """
+    Incrementally pull the value of the "response" string out of a JSON
+    completion while it is still being generated.
+    """
+    KEY = re.compile(r'"response"\s*:\s*"')
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = None
+        self.done = False
+
+    def feed(self, delta):
+        self.buffer += delta
+        if self.done:
+            return ''
+        if self.pos is None:
+            match = self.KEY.search(self.buffer)
+            if not match:
+                return ''
+            self.pos = match.end()
+
+        out = []
+        buffer, i = self.buffer, self.pos
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '\\':
+                if i + 1 >= len(buffer):
+                    break  # wait for the rest of the escape sequence
+                escape = buffer[i + 1]
+                if escape == 'u':
+                    if i + 6 > len(buffer):
+                        break
+                    try:
+                        out.append(chr(int(buffer[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(JSON_ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            out.append(char)
+            i += 1
+        self.pos = i
+        return ''.join(out)
+
+
+def sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'.encode()
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def chat_stream(scope, receive, send):
+    if scope['method'] == 'OPTIONS':
+        await send({'type': 'http.response.start', 'status': 200, 'headers': CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    body = await read_body(receive)
+    if body is None:
+        return
+    user_message, conversation_id, previous_state = read_chat_request(body)
+    if scope['method'] != 'POST' or not user_message:
+        status = 405 if scope['method'] != 'POST' else 400
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json')] + CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': b'{"response": "No user message received."}'})
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ] + CORS_HEADERS,
+    })
+
+    async def emit(event, data):
+        await send({'type': 'http.response.body', 'body': sse(event, data), 'more_body': True})
+
+    conversation_id, state = await sync_to_async(load_conversation)(conversation_id, previous_state)
+    parsed, confidence = await sync_to_async(extract_turn)(user_message, state)
+    key = cache_key(user_message, state)
+    cached = response_cache.lookup(key) if confidence < FAST_PATH_THRESHOLD else None
+    if cached is not None:
+        # Streams are not coalesced (each needs its own deltas), but a cached
+        # answer is replayed at once
+        parsed = cached
+        await emit('delta', {'text': parsed['response']})
+    elif confidence < FAST_PATH_THRESHOLD:
+        extractor = ResponseTextExtractor()
+        started = time.monotonic()
+        try:
+            async for delta in llm.stream(build_prompt(user_message, state)):
+                text = extractor.feed(delta)
+                if text:
+                    await emit('delta', {'text': text})
+            parsed = parse_completion(extractor.buffer.strip(), state)
+        except asyncio.TimeoutError:
+            logger.warning('Timed out waiting for the LLM')
+            parsed = None
+        except Exception:
+            logger.exception('LLM stream failed')
+            parsed = None
+        response_cache.store(key, parsed, time.monotonic() - started)
+    else:
+        await emit('delta', {'text': parsed['response']})
+
+    if parsed is None:
+        parsed = FALLBACK_RESPONSE
+    else:
+        await sync_to_async(save_turn)(conversation_id, state, parsed)
+    await emit('result', dict(parsed, conversation_id=conversation_id))
+    await send({'type': 'http.response.body', 'body': b''})
@@ -0,0 +1,111 @@
+"""
+Offline stand-in for the LLM, for local development and benchmarks.
+
+Completions are replayed from a recording (AI/fixtures/recorded_completions.json
+by default): the first entry whose "match" text occurs in the user message
+wins. Latency and failures are simulated from the AI_LLM['STUB'] settings:
+
+    'STUB': {'LATENCY_MS': 300, 'JITTER_MS': 100, 'FAILURE_RATE': 0.05,
+             'COMPLETIONS': '/path/to/recording.json'}
+
+StubBackend plugs the stand-in into AI.llm in-process; the llm_stub_server
+command serves the same replies over an OpenAI-compatible HTTP API.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+
+from .llm import llm_setting
+
+DEFAULT_COMPLETIONS = os.path.join(os.path.dirname(__file__), 'fixtures', 'recorded_completions.json')
+
+STUB_DEFAULTS = {
+    'LATENCY_MS': 300,
+    'JITTER_MS': 100,
+    'FAILURE_RATE': 0.0,
+    'COMPLETIONS': DEFAULT_COMPLETIONS,
+}
+
+USER_LINE = re.compile(r'^User: (.*)$', re.MULTILINE)
+
+# Size of the pieces a streamed reply is split into
+STREAM_PIECE = 12
+
+
+class StubFailure(Exception):
+    """A simulated upstream error."""
+
+
+def load_completions(path):
+    with open(path, encoding='utf-8') as f:
+        return [(entry['match'].lower(), entry['completion']) for entry in json.load(f)]
+
+
+def user_message(messages):
+    prompt = messages[-1]['content']
+    match = USER_LINE.search(prompt)
+    if not match:
+        return prompt
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return match.group(1)
+
+
+class StubLLM:
+    def __init__(self, completions=None, latency_ms=0, jitter_ms=0, failure_rate=0.0, seed=None):
+        self.completions = load_completions(completions or DEFAULT_COMPLETIONS)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls):
+        options = dict(STUB_DEFAULTS, **llm_setting('STUB'))
+        return cls(
+            completions=options['COMPLETIONS'],
+            latency_ms=options['LATENCY_MS'],
+            jitter_ms=options['JITTER_MS'],
+            failure_rate=options['FAILURE_RATE'],
+        )
+
+    def delay(self):
+        """Seconds to wait before answering."""
+        jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def fails(self):
+        return self.failure_rate > 0 and self.random.random() < self.failure_rate
+
+    def reply(self, messages):
+        text = user_message(messages).lower()
+        for match, completion in self.completions:
+            if match in text:
+                return completion
+        raise StubFailure('No recorded completion matches')
+
+    def pieces(self, text):
+        return [text[i:i + STREAM_PIECE] for i in range(0, len(text), STREAM_PIECE)]
+
+
+class StubBackend:
+    """AI.llm backend answering from StubLLM without any network access."""
+
+    def __init__(self):
+        self.stub = StubLLM.from_settings()
+
+    async def complete(self, messages):
+        await asyncio.sleep(self.stub.delay())
+        if self.stub.fails():
+            raise StubFailure('Simulated upstream failure')
+        return self.stub.reply(messages)
+
+    async def stream(self, messages):
+        await asyncio.sleep(self.stub.delay())
+        if self.stub.fails():
+            raise StubFailure('Simulated upstream failure')
+        for piece in self.stub.pieces(self.stub.reply(messages)):
+            yield piece
@@ -3,5 +3,6 @@ from .views import *
 
 urlpatterns = [
     path('chat/', chat_with_ai),
+    path('chat/cache-stats/', chat_cache_stats),
     path('services/by-name/<str:name>/', get_service_by_name),
 ]
@@ -1,107 +1,166 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from openai import OpenAI
 from api.models import Service
+from api.mongo import to_decimal
+from api.service_names import service_names
 import json
-from rest_framework.permissions import AllowAny
-from bson import ObjectId
-
-# Create OpenAI client targeting OpenRouter
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key="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",
+import asyncio
+import logging
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.permissions import AllowAny, IsAdminUser
+from .intents import extract_turn, FAST_PATH_THRESHOLD, RESPONSE_FIELDS
+from . import llm
+from . import sessions
+from .cache import cache_key, response_cache
+
+logger = logging.getLogger(__name__)
+
+PROMPT_FIELDS = ['intent', 'serviceType', 'date', 'time', 'instructions']
+
+FALLBACK_RESPONSE = {
+    "response": "Sorry, something went wrong. Please try again.",
+    "intent": None,
+    "serviceType": None,
+    "date": None,
+    "time": None,
+    "instructions": None,
+    "booked": False,
+    "completed_service": False
+}
+
+
+# Compiled once; per turn only the set state fields and the message are
+# filled in, so the prompt stays the same size however long the chat runs.
+PROMPT_TEMPLATE = (
+    'You are an AI booking assistant for hostel services '
+    '(laundry, room cleaning, study space, room repairs, tech support). Today is {today}.\n'
+    'Update the booking from the user message. Resolve relative dates ("tomorrow", "next Monday") '
+    'to YYYY-MM-DD; intent is one of book, cancel, reschedule, info, other.\n'
+    'Reply with JSON only: {{"response": "<reply to the user>"}} plus only the fields that change '
+    '(intent, serviceType, date, time, instructions).\n'
+    'Known: {state}\n'
+    'User: {message}'
 )
 
-@api_view(['POST'])
-def chat_with_ai(request):
-    user_message = request.data.get('user_message', '').strip()
-    previous_state = request.data.get('previous_state', {})
 
-    if not user_message:
-        return Response({'response': 'No user message received.'}, status=400)
+def build_prompt(user_message, state, today=None):
+    known = '; '.join(f'{field}={state[field]}' for field in PROMPT_FIELDS if state.get(field)) or 'nothing yet'
+    return PROMPT_TEMPLATE.format(
+        today=(today or date.today()).isoformat(),
+        state=known,
+        message=json.dumps(user_message, ensure_ascii=False),
+    )
 
-    prompt = f"""
-        You are an AI booking assistant.
 
-        You will get:
-        - context: previous extracted fields (intent, serviceType, date, time, instructions)
-        - user_message: new user input
+def parse_completion(raw_text, state=None):
+    """Merge the fields the model returned into `state` (full schema out)."""
+    changes = json.loads(raw_text)
+    parsed = {field: (state or {}).get(field) for field in RESPONSE_FIELDS}
+    for field in RESPONSE_FIELDS:
+        if changes.get(field) is not None:
+            parsed[field] = changes[field]
+    parsed['booked'] = bool(parsed['date'] and parsed['time'])
+    parsed['completed_service'] = False
+    return parsed
 
-        Update the fields based on user input.
 
-        **Important:**
-        - If user says "tomorrow", "today", "next Monday", etc., resolve to actual date in format: "2025-07-14"
-        - intent should always be lowercased: one of: "book", "cancel", "reschedule", "info", "other"
-        - serviceType: "laundry", "room cleaning", "study space", "room repairs", "tech support"
-        - booked should be true only if date and time are both set.
-        - completed_service always stays false.
+def read_chat_request(body):
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    user_message = str(data.get('user_message') or '').strip()
+    conversation_id = str(data.get('conversation_id') or '')[:64]
+    # The client's copy of the state, used when the server has none for the id
+    previous_state = data.get('previous_state') or {}
+    return user_message, conversation_id, previous_state
+
 
-        Return only valid JSON:
-        {{
-        "response": "...",
-        "intent": "...",
-        "serviceType": "...",
-        "date": "...",  # resolved date like "2025-07-14"
-        "time": "...",
-        "instructions": "...",
-        "booked": true/false,
-        "completed_service": false
-        }}
+def load_conversation(conversation_id, previous_state):
+    """Return (conversation id, current state), starting a new conversation if needed."""
+    state = sessions.load_state(conversation_id) if conversation_id else None
+    if state is None:
+        conversation_id = conversation_id or sessions.new_conversation_id()
+        state = sessions.clean_state(previous_state)
+    return conversation_id, state
 
-        context:
-        {json.dumps(previous_state, ensure_ascii=False)}
 
-        user_message: "{user_message}"
-        """
+def save_turn(conversation_id, state, parsed):
+    sessions.apply_diff(conversation_id, state, sessions.diff_state(state, parsed))
 
 
+async def complete_turn(user_message, state):
+    """Ask the LLM for this turn; None if the call failed."""
     try:
-        completion = client.chat.completions.create(
-            model="mistralai/mistral-7b-instruct:free",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant to book hostel services."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-        )
-
-        raw_text = completion.choices[0].message.content.strip()
-
-        # Parse the JSON safely
-        parsed = json.loads(raw_text)
-
-        # Ensure required fields exist
-        required_fields = ["response", "intent", "serviceType", "date", "time", "instructions", "booked", "completed_service"]
-        for field in required_fields:
-            if field not in parsed:
-                parsed[field] = None if field not in ["booked", "completed_service"] else False
-
-        return Response(parsed)
-
-    except Exception as e:
-        print("Error from OpenRouter:", e)
-        fallback = {
-            "response": "Sorry, something went wrong. Please try again.",
-            "intent": None,
-            "serviceType": None,
-            "date": None,
-            "time": None,
-            "instructions": None,
-            "booked": False,
-            "completed_service": False
-        }
-        return Response(fallback, status=500)
-    
-from bson.decimal128 import Decimal128
+        raw_text = await llm.complete(build_prompt(user_message, state))
+        return parse_completion(raw_text, state)
+    except asyncio.TimeoutError:
+        logger.warning('Timed out waiting for the LLM')
+    except Exception:
+        logger.exception('LLM completion failed')
+    return None
+
+
+async def chat_with_ai(request):
+    """
+    Async view: the upstream completion is awaited on the event loop, so a
+    slow LLM no longer ties up a worker that booking requests need.
+
+    Send `conversation_id` from the previous reply to continue a chat, plus
+    the last known state as `previous_state`; the server keeps the state and
+    only falls back to the client's copy when it has none for that id.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+    user_message, conversation_id, previous_state = read_chat_request(request.body)
+    if not user_message:
+        return JsonResponse({'response': 'No user message received.'}, status=400)
+    conversation_id, state = await sync_to_async(load_conversation)(conversation_id, previous_state)
+
+    # Most turns are handled by the local parser in milliseconds; the LLM is
+    # only asked when it is unsure.
+    parsed, confidence = await sync_to_async(extract_turn)(user_message, state)
+    outcome = 'fast-path'
+    if confidence < FAST_PATH_THRESHOLD:
+        key = cache_key(user_message, state)
+        parsed, outcome = await response_cache.get_or_compute(key, lambda: complete_turn(user_message, state))
+
+    if parsed is None:
+        response = JsonResponse(dict(FALLBACK_RESPONSE, conversation_id=conversation_id), status=500)
+    else:
+        await sync_to_async(save_turn)(conversation_id, state, parsed)
+        response = JsonResponse(dict(parsed, conversation_id=conversation_id))
+    response['X-Chat-Cache'] = outcome
+    return response
+
+
+# csrf_exempt() wraps views in a sync function on this Django version, which
+# would hide the coroutine; set the flag the CSRF middleware checks instead.
+chat_with_ai.csrf_exempt = True
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def chat_cache_stats(request):
+    """Hit rate and upstream latency saved by this process's chat cache."""
+    return Response(response_cache.stats())
+
 
 @api_view(['GET'])
 def get_service_by_name(request, name):
-    service = Service.objects.filter(name__iexact=name).first()
+    # Resolved through the in-process name index (case-insensitive, aliases
+    # included) so the lookup itself is a primary-key read
+    service_id = service_names.resolve(name)
+    service = Service.objects.filter(id=service_id).first() if service_id is not None else None
     if not service:
         return Response({'error': 'Service not found'}, status=404)
 
-    # Convert Decimal128 to float or str
-    price = float(service.price.to_decimal()) if isinstance(service.price, Decimal128) else float(service.price)
+    price = float(to_decimal(service.price))
 
     return Response({
         'id': str(service.id),
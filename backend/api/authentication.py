@@ -0,0 +1,103 @@
+"""
+JWT authentication that builds request.user from token claims.
+
+Access tokens issued by tokens_for_user() carry the user fields the views
+read (CLAIM_FIELDS) plus a fingerprint of them. On safe requests whose
+fingerprint still matches, request.user is a User instance built from the
+claims with every other field deferred, like a `.only()` row, so the
+per-request user lookup is skipped. Write requests, tokens without claims
+and stale fingerprints load the user from the database as before.
+
+The current fingerprint per user is cached for JWT_CLAIMS_TTL seconds and
+refreshed by the User signals, so a role change or deactivation made by
+another process is picked up within that time.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Everything the views and ProfileSerializer read from request.user
+CLAIM_FIELDS = ['username', 'email', 'room_number', 'is_serviceprovider', 'is_superuser', 'is_staff', 'is_active']
+VERSION_CLAIM = 'claims_version'
+CACHE_PREFIX = 'auth:claims:'
+
+
+def claims_version(values):
+    """Fingerprint of a user's CLAIM_FIELDS values, in CLAIM_FIELDS order."""
+    return hashlib.blake2b(repr(tuple(values)).encode(), digest_size=8).hexdigest()
+
+
+def remember_claims(user):
+    version = claims_version(getattr(user, field) for field in CLAIM_FIELDS)
+    cache.set(f'{CACHE_PREFIX}{user.pk}', version, getattr(settings, 'JWT_CLAIMS_TTL', 60))
+    return version
+
+
+def forget_claims(user_id):
+    cache.delete(f'{CACHE_PREFIX}{user_id}')
+
+
+def current_claims_version(user_id):
+    """The user's current fingerprint, or None if the user no longer exists."""
+    version = cache.get(f'{CACHE_PREFIX}{user_id}')
+    if version is None:
+        values = get_user_model().objects.filter(pk=user_id).values_list(*CLAIM_FIELDS).first()
+        if values is None:
+            return None
+        version = claims_version(values)
+        cache.set(f'{CACHE_PREFIX}{user_id}', version, getattr(settings, 'JWT_CLAIMS_TTL', 60))
+    return version
+
+
+def tokens_for_user(user):
+    """A RefreshToken whose access tokens carry the user's claims."""
+    refresh = RefreshToken.for_user(user)
+    for field in CLAIM_FIELDS:
+        refresh[field] = getattr(user, field)
+    refresh[VERSION_CLAIM] = remember_claims(user)
+    return refresh
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method not in SAFE_METHODS:
+            return super().get_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        version = validated_token.get(VERSION_CLAIM)
+        if version is None or version != current_claims_version(user_id):
+            return super().get_user(validated_token)
+
+        User = get_user_model()
+        claims = {api_settings.USER_ID_FIELD: user_id}
+        claims.update((field, validated_token[field]) for field in CLAIM_FIELDS)
+        fields = [f for f in User._meta.concrete_fields if f.name in claims]
+        user = User.from_db(
+            router.db_for_read(User), [f.attname for f in fields], [claims[f.name] for f in fields]
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
@@ -0,0 +1,85 @@
+"""
+Helpers shared by the benchmark commands (benchmark_api, benchmark_chat):
+a fixed-concurrency driver, latency summaries and baseline comparison.
+"""
+import math
+import threading
+import time
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_concurrent(call, total, concurrency):
+    """
+    Run `call(worker_index)` `total` times from `concurrency` threads. `call`
+    returns True on success. Returns (latencies in seconds, errors, elapsed).
+    """
+    latencies, errors = [], [0]
+    remaining = [total]
+    lock = threading.Lock()
+
+    def worker(index):
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            try:
+                ok = call(index)
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - started
+
+
+def summarize(latencies, errors, elapsed):
+    ms = sorted(seconds * 1000 for seconds in latencies)
+    return {
+        'requests': len(ms),
+        'errors': errors,
+        'error_rate': round(errors / len(ms), 4) if ms else 0.0,
+        'throughput_rps': round(len(ms) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(ms, 50), 2),
+        'p95_ms': round(percentile(ms, 95), 2),
+        'p99_ms': round(percentile(ms, 99), 2),
+    }
+
+
+def find_regressions(baseline, current, threshold):
+    """
+    Compare {driver: {scenario: summary}} results. A scenario regresses when
+    its throughput drops, or its p95 latency grows, by more than `threshold`
+    (a fraction) against the baseline, or when it starts failing requests.
+    """
+    regressions = []
+    for driver, scenarios in current.items():
+        for name, now in scenarios.items():
+            before = baseline.get(driver, {}).get(name)
+            if before is None:
+                continue
+            label = f'{driver}/{name}'
+            if now['throughput_rps'] < before['throughput_rps'] * (1 - threshold):
+                regressions.append(f"{label}: throughput {now['throughput_rps']} < {before['throughput_rps']} rps")
+            if now['p95_ms'] > before['p95_ms'] * (1 + threshold):
+                regressions.append(f"{label}: p95 {now['p95_ms']} > {before['p95_ms']} ms")
+            if now['errors'] and not before['errors']:
+                regressions.append(f"{label}: {now['errors']} failed request(s)")
+    return regressions
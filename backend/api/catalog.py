@@ -0,0 +1,40 @@
+import hashlib
+
+from django.core.cache import caches
+from rest_framework.renderers import JSONRenderer
+
+from .models import Service
+from .serializers import ServiceSerializer
+
+CATALOG_CACHE_KEY = 'api:service-catalog'
+
+# Service signals clear the entry in this process; the timeout bounds how long
+# another worker can keep serving a catalog changed elsewhere.
+CATALOG_TIMEOUT = 300
+
+
+def get_catalog_cache():
+    return caches['default']
+
+
+def build_catalog():
+    services = Service.objects.filter(availability=True).order_by('id')
+    body = JSONRenderer().render(ServiceSerializer(services, many=True).data)
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    return body, etag
+
+
+def get_catalog():
+    """
+    Return the pre-rendered JSON body of the available services and its ETag.
+    """
+    cache = get_catalog_cache()
+    cached = cache.get(CATALOG_CACHE_KEY)
+    if cached is None:
+        cached = build_catalog()
+        cache.set(CATALOG_CACHE_KEY, cached, CATALOG_TIMEOUT)
+    return cached
+
+
+def invalidate_catalog():
+    get_catalog_cache().delete(CATALOG_CACHE_KEY)
@@ -0,0 +1,87 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Booking, Service, StatCounter
+
+TOTAL_SERVICES = 'services:total'
+TOTAL_BOOKINGS = 'bookings:total'
+USER_BOOKINGS_PREFIX = 'bookings:user:'
+
+
+def user_bookings_key(user_id):
+    return f'{USER_BOOKINGS_PREFIX}{user_id}'
+
+
+def compute(key):
+    if key == TOTAL_SERVICES:
+        return Service.objects.count()
+    if key == TOTAL_BOOKINGS:
+        return Booking.objects.count()
+    if key.startswith(USER_BOOKINGS_PREFIX):
+        return Booking.objects.filter(user_id=int(key[len(USER_BOOKINGS_PREFIX):])).count()
+    raise KeyError(key)
+
+
+def increment(key, delta=1):
+    """
+    Add `delta` to counter `key`. Callers run after the write, so a counter
+    that does not exist yet is seeded from a real count that already includes
+    it, instead of the increment being lost.
+    """
+    counters = StatCounter.objects.filter(key=key)
+    if counters.update(value=F('value') + delta, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            StatCounter.objects.create(key=key, value=compute(key))
+    except IntegrityError:
+        # Seeded concurrently; any double count is fixed by reconcile()
+        counters.update(value=F('value') + delta, updated_at=timezone.now())
+
+
+def get_counts(keys):
+    """
+    Return {key: value} for `keys` with a single indexed lookup, seeding any
+    missing counter from the database.
+    """
+    counts = dict(StatCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+    for key in keys:
+        if key not in counts:
+            counts[key] = compute(key)
+            try:
+                StatCounter.objects.create(key=key, value=counts[key])
+            except IntegrityError:
+                pass  # seeded concurrently by another request
+    return counts
+
+
+def reconcile():
+    """
+    Recompute every counter from the source collections and fix the ones that
+    drifted (e.g. after bulk inserts, which skip signals). Returns the number
+    of counters changed.
+    """
+    expected = {
+        TOTAL_SERVICES: Service.objects.count(),
+        TOTAL_BOOKINGS: Booking.objects.count(),
+    }
+    for user_id, total in Booking.objects.values('user_id').annotate(total=Count('id')).values_list('user_id', 'total'):
+        expected[user_bookings_key(user_id)] = total
+
+    current = dict(StatCounter.objects.values_list('key', 'value'))
+    for key in current:
+        if key.startswith(USER_BOOKINGS_PREFIX):
+            expected.setdefault(key, 0)
+
+    now = timezone.now()
+    changed = 0
+    missing = []
+    for key, value in expected.items():
+        if key not in current:
+            missing.append(StatCounter(key=key, value=value))
+        elif current[key] != value:
+            StatCounter.objects.filter(key=key).update(value=value, updated_at=now)
+            changed += 1
+    StatCounter.objects.bulk_create(missing, batch_size=1000)
+    return changed + len(missing)
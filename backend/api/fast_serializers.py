@@ -0,0 +1,128 @@
+"""
+Read-only, `.values()`-based equivalents of the list serializers in
+api/serializers.py. Each one is compiled once from a field spec into a plain
+row -> dict function, skipping model instantiation and DRF field binding.
+
+The output must stay identical to the matching ModelSerializer: same keys in
+the same order, with DRF's own fields used for the non-trivial conversions.
+"""
+from rest_framework import serializers
+
+_date = serializers.DateField().to_representation
+_datetime = serializers.DateTimeField().to_representation
+_price = serializers.DecimalField(max_digits=8, decimal_places=2).to_representation
+
+
+def _float(value):
+    return float(value)
+
+
+class RowSerializer:
+    """
+    `fields` is a list of (output name, values() lookup, converter) tuples, or
+    (output name, nested RowSerializer) for a nested object. A converter of
+    None passes the database value through unchanged; like DRF, None values
+    are never converted.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.plan = self._compile(fields, '')
+        self.lookups = list(self._iter_lookups(self.plan))
+
+    @classmethod
+    def _compile(cls, fields, prefix):
+        plan = []
+        for spec in fields:
+            if isinstance(spec[1], RowSerializer):
+                name, nested = spec
+                plan.append((name, None, cls._compile(nested.fields, f'{prefix}{name}__')))
+            else:
+                name, lookup, convert = spec
+                plan.append((name, prefix + lookup, convert))
+        return plan
+
+    @classmethod
+    def _iter_lookups(cls, plan):
+        for name, lookup, convert in plan:
+            if lookup is None:
+                yield from cls._iter_lookups(convert)
+            else:
+                yield lookup
+
+    def to_dict(self, row, plan=None):
+        data = {}
+        for name, lookup, convert in plan or self.plan:
+            if lookup is None:
+                data[name] = self.to_dict(row, convert)
+                continue
+            value = row[lookup]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+    def serialize(self, queryset):
+        return [self.to_dict(row) for row in queryset.values(*self.lookups)]
+
+    def iterate(self, queryset, chunk_size=2000):
+        for row in queryset.values(*self.lookups).iterator(chunk_size=chunk_size):
+            yield self.to_dict(row)
+
+
+# Mirrors ServiceSerializer
+service_rows = RowSerializer([
+    ('id', 'id', None),
+    ('name', 'name', None),
+    ('description', 'description', None),
+    ('price', 'price', _price),
+    ('duration', 'duration', None),
+    ('rating', 'rating', _float),
+    ('availability', 'availability', None),
+    ('provider_name', 'provider_name', None),
+])
+
+# Mirrors BookingSerializer (read side; service_id is write-only)
+booking_rows = RowSerializer([
+    ('id', 'id', None),
+    ('user', 'user_id', None),
+    ('service', service_rows),
+    ('date', 'date', _date),
+    ('time_slot', 'time_slot', None),
+    ('special_instructions', 'special_instructions', None),
+    ('status', 'status', None),
+    ('rating', 'rating', None),
+    ('comment', 'comment', None),
+    ('provider_name', 'user__username', None),
+    ('room_number', 'user__room_number', None),
+])
+
+# Mirrors UserSerializer
+user_rows = RowSerializer([
+    ('id', 'id', None),
+    ('email', 'email', None),
+    ('name', 'name', None),
+    ('username', 'username', None),
+    ('room_number', 'room_number', None),
+    ('is_superuser', 'is_superuser', None),
+    ('is_serviceprovider', 'is_serviceprovider', None),
+])
+
+# Mirrors NotificationSerializer
+notification_rows = RowSerializer([
+    ('id', 'id', None),
+    ('message', 'message', None),
+    ('created_at', 'created_at', _datetime),
+    ('read', 'read', None),
+])
+
+# One cell of the provider calendar grid (no DRF counterpart)
+calendar_rows = RowSerializer([
+    ('id', 'id', None),
+    ('date', 'date', _date),
+    ('time_slot', 'time_slot', None),
+    ('service_id', 'service_id', None),
+    ('service_name', 'service__name', None),
+    ('status', 'status', None),
+    ('special_instructions', 'special_instructions', None),
+    ('student', 'user__username', None),
+    ('room_number', 'user__room_number', None),
+])
@@ -0,0 +1,229 @@
+import logging
+import re
+from collections import OrderedDict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from api.authentication import tokens_for_user
+from api.management.commands.check_query_budgets import CASES, STEADY_OCCUPANCY, STUB_LLM, build_fixture, fill
+from api.mongo import is_mongo
+
+# Mongo commands that read through an index and can be explained.
+EXPLAINABLE = {'find', 'aggregate', 'count', 'distinct', 'update', 'delete', 'findAndModify'}
+# Per-session fields the driver adds that explain rejects.
+SESSION_FIELDS = {'lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber', 'autocommit', 'startTransaction'}
+RANGE_OPERATORS = {'$gt', '$gte', '$lt', '$lte', '$ne', '$nin', '$regex', '$exists'}
+# (route, table) scans that are fine: the catalog filters a low-selectivity
+# flag on a small table, and is only read when its cache is rebuilt.
+EXPECTED_SCANS = {('api/services', 'api_service')}
+
+
+def mongo_listener():
+    """A pymongo command listener that records what each endpoint sends."""
+    from pymongo import monitoring
+
+    class CommandCapture(monitoring.CommandListener):
+        def __init__(self):
+            self.route = None
+            self.commands = []
+
+        def started(self, event):
+            if self.route and event.command_name in EXPLAINABLE:
+                command = OrderedDict((k, v) for k, v in event.command.items() if k not in SESSION_FIELDS)
+                self.commands.append((self.route, command))
+
+        def succeeded(self, event):
+            pass
+
+        def failed(self, event):
+            pass
+
+    listener = CommandCapture()
+    monitoring.register(listener)
+    return listener
+
+
+def winning_stages(explain):
+    """Stage names in the winning plan(s) of an explain result, rejected plans excluded."""
+    stages = []
+
+    def walk(node, in_plan):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == 'rejectedPlans':
+                    continue
+                inside = in_plan or key == 'winningPlan'
+                if inside and key == 'stage' and isinstance(value, str):
+                    stages.append(value)
+                walk(value, inside)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_plan)
+
+    walk(explain, False)
+    return stages
+
+
+def filter_fields(query, equality, ranges):
+    for key, value in query.items():
+        if key in ('$and', '$or', '$nor'):
+            for clause in value:
+                filter_fields(clause, equality, ranges)
+        elif not key.startswith('$'):
+            is_range = isinstance(value, dict) and any(op in RANGE_OPERATORS for op in value)
+            target = ranges if is_range else equality
+            if key not in target:
+                target.append(key)
+
+
+def query_shape(command):
+    """(collection, equality fields, sort fields, range fields) of a captured command."""
+    name = next(iter(command))
+    query, sort = {}, {}
+    if name in ('find', 'findAndModify'):
+        query, sort = command.get('filter') or command.get('query') or {}, command.get('sort') or {}
+    elif name == 'aggregate':
+        for stage in command.get('pipeline', []):
+            if '$match' in stage and not query:
+                query = stage['$match']
+            elif '$sort' in stage and not sort:
+                sort = stage['$sort']
+            elif '$lookup' in stage or '$group' in stage:
+                break
+    elif name in ('count', 'distinct'):
+        query = command.get('query') or {}
+    elif name in ('update', 'delete'):
+        statements = command.get('updates') or command.get('deletes') or [{}]
+        query = statements[0].get('q') or {}
+
+    equality, ranges = [], []
+    filter_fields(query, equality, ranges)
+    sort_fields = [field for field in sort if field not in equality]
+    ranges = [field for field in ranges if field not in equality and field not in sort_fields]
+    return command[name], equality, sort_fields, ranges
+
+
+def declared_indexes(model):
+    """Field lists of every index Django declares for `model`."""
+    indexes = [[field.lstrip('-') for field in index.fields] for index in model._meta.indexes]
+    indexes += [list(fields) for fields in model._meta.unique_together]
+    indexes += [[field.name] for field in model._meta.concrete_fields
+                if field.primary_key or field.unique or field.db_index]
+    return indexes
+
+
+def suggest_index(collection, equality, sort_fields, ranges):
+    """
+    The equality-sort-range key for a query, in model field names, and
+    whether a declared index already serves it. None for unknown collections
+    and unfiltered reads, which scan by design.
+    """
+    model = next((m for m in apps.get_models() if m._meta.db_table == collection), None)
+    if model is None or not (equality or ranges):
+        return None
+    key = equality + sort_fields + ranges
+    names = {field.column: field.name for field in model._meta.concrete_fields}
+    key = [names.get(column, column) for column in key]
+    lead = len(equality) or 1
+    covered = any(set(index[:lead]) == set(key[:lead]) for index in declared_indexes(model))
+    return model, key, covered
+
+
+class Command(BaseCommand):
+    help = ('Run every API endpoint against a test database, explain the queries each one issues, '
+            'and flag collection scans and queries no declared index serves.')
+
+    def handle(self, *args, **options):
+        listener = mongo_listener() if is_mongo() else None
+
+        logging.getLogger('api.queries').setLevel(logging.WARNING)
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(NOTIFICATION_OUTBOX={'INLINE_WORKER': False}, AI_LLM=STUB_LLM,
+                                   OCCUPANCY_INDEX=STEADY_OCCUPANCY):
+                findings = self.run_cases(listener)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if findings:
+            raise CommandError(f'{len(findings)} quer(ies) without a usable index')
+        self.stdout.write(self.style.SUCCESS('Every filtered query is served by an index'))
+
+    def run_cases(self, listener):
+        users, ids = build_fixture()
+        tokens = {role: str(tokens_for_user(user).access_token) for role, user in users.items()}
+        statements = []
+
+        def capture(execute, sql, params, many, context):
+            statements.append((route, sql, params))
+            return execute(sql, params, many, context)
+
+        for route, method, role, path, body, expected, budget in CASES:
+            client = APIClient(raise_request_exception=False)
+            if role:
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens[role]}')
+            if listener:
+                listener.route = route
+                getattr(client, method)(fill(path, ids), fill(body, ids), format='json')
+            else:
+                with connection.execute_wrapper(capture):
+                    getattr(client, method)(fill(path, ids), fill(body, ids), format='json')
+        if listener:
+            listener.route = None
+            return self.explain_mongo(listener.commands)
+        return self.explain_sql(statements)
+
+    def explain_mongo(self, commands):
+        database = connection.connection
+        findings, seen = [], set()
+        for route, command in commands:
+            collection, equality, sort_fields, ranges = query_shape(command)
+            shape = (route, collection, tuple(equality), tuple(sort_fields), tuple(ranges))
+            if shape in seen:
+                continue
+            seen.add(shape)
+            suggestion = suggest_index(collection, equality, sort_fields, ranges)
+            if suggestion is None or (route, collection) in EXPECTED_SCANS:
+                continue
+            model, key, covered = suggestion
+            explain = database.command('explain', command, verbosity='queryPlanner')
+            scanned = 'COLLSCAN' in winning_stages(explain)
+            if scanned or not covered:
+                findings.append(route)
+                label = 'COLLSCAN ' if scanned else 'UNDECLARED'
+                self.stdout.write(
+                    f'{label} {route:60} {collection}: add '
+                    f'models.Index(fields={key!r}) to {model.__name__}.Meta.indexes'
+                )
+        return findings
+
+    def explain_sql(self, statements):
+        """Relational backends: flag full table scans in EXPLAIN output of filtered statements."""
+        if connection.vendor == 'sqlite':
+            prefix, scan = 'EXPLAIN QUERY PLAN ', re.compile(r'\bSCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)')
+        elif connection.vendor == 'postgresql':
+            prefix, scan = 'EXPLAIN ', re.compile(r'Seq Scan on (\w+)')
+        else:
+            raise CommandError(f'No explain support for the {connection.vendor} backend')
+
+        findings, seen = [], set()
+        with connection.cursor() as cursor:
+            for route, sql, params in statements:
+                if (route, sql) in seen or ' WHERE ' not in sql:
+                    continue
+                seen.add((route, sql))
+                cursor.execute(prefix + sql, params)
+                for table in {match.group(1) for row in cursor.fetchall()
+                              for match in [scan.search(str(row[-1]))] if match} - {
+                                  table for expected_route, table in EXPECTED_SCANS if expected_route == route}:
+                    findings.append(route)
+                    self.stdout.write(f'SCAN      {route:60} {table}: {sql[:160]}')
+        return findings
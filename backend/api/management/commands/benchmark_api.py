@@ -0,0 +1,260 @@
+import http.client
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from api.authentication import tokens_for_user
+from api.benchmarks import find_regressions, run_concurrent, summarize
+from api.models import Booking, Service, User
+from api.management.commands.generate_dataset import EMAIL_DOMAIN
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'api-baseline.json')
+
+SCENARIOS = ['login', 'booking_create', 'availability', 'my_bookings', 'notifications']
+DRIVERS = ['client', 'asgi']
+
+# Dataset sizes per --scale step
+SCALE_USERS = 500
+SCALE_BOOKINGS = 20000
+
+SLOTS = [slot for slot, _ in Booking.SERVICE_TIMES]
+
+
+class Fixture:
+    """Users, tokens and a supply of free slots for the booking scenario."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        users = list(User.objects.filter(email__endswith='@' + EMAIL_DOMAIN, is_serviceprovider=False)
+                     .order_by('id')[:200])
+        if not users:
+            raise CommandError('The benchmark dataset has no users')
+        self.emails = [user.email for user in users]
+        self.tokens = [str(tokens_for_user(user).access_token) for user in users]
+        self.service_ids = list(Service.objects.values_list('id', flat=True))
+        # Bookings go beyond the generated range, so every one is a fresh slot.
+        last = Booking.objects.order_by('-date').values_list('date', flat=True).first() or date.today()
+        self.free_slots = (
+            (service_id, (last + timedelta(days=day)).isoformat(), slot)
+            for day in itertools.count(1) for service_id in self.service_ids for slot in SLOTS
+        )
+        self.lock = threading.Lock()
+
+    def next_slot(self):
+        with self.lock:
+            return next(self.free_slots)
+
+    def random_day(self):
+        return (date.today() + timedelta(days=self.rng.randint(-30, 30))).isoformat()
+
+    def request(self, scenario, worker):
+        """(method, path, body, token) for one request of `scenario`."""
+        token = self.tokens[worker % len(self.tokens)]
+        if scenario == 'login':
+            return 'POST', '/api/auth/login', {'email': self.emails[worker % len(self.emails)],
+                                               'password': 'loadtest'}, None
+        if scenario == 'booking_create':
+            service_id, day, slot = self.next_slot()
+            return 'POST', '/api/bookings', {'service_id': service_id, 'date': day, 'time_slot': slot}, token
+        if scenario == 'availability':
+            service_id = self.rng.choice(self.service_ids)
+            return 'GET', f'/api/bookings/availability?service_id={service_id}&date={self.random_day()}', None, token
+        if scenario == 'my_bookings':
+            return 'GET', '/api/bookings/my', None, token
+        return 'GET', '/api/notifications/user', None, token
+
+
+class ClientDriver:
+    """Django's test client, one per thread, through the full middleware stack."""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def send(self, method, path, body, token):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client(raise_request_exception=False)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        if method == 'GET':
+            return client.get(path, **headers).status_code
+        return client.post(path, json.dumps(body), content_type='application/json', **headers).status_code
+
+
+class AsgiDriver:
+    """The ASGI application under a real uvicorn server on a local port, keep-alive connections per thread."""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def __enter__(self):
+        try:
+            import uvicorn
+        except ImportError:
+            raise CommandError('The asgi driver needs uvicorn (pip install uvicorn)')
+        from backend.asgi import application
+
+        config = uvicorn.Config(application, host='127.0.0.1', port=0, log_level='warning', lifespan='off')
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise CommandError('uvicorn did not start')
+            time.sleep(0.05)
+        self.port = self.server.servers[0].sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+    def send(self, method, path, body, token):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        try:
+            conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self.local.conn = None
+            raise
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the hot booking API endpoints on a generated dataset in a throwaway test database, '
+            'through the Django test client and a real ASGI server. Results are compared with a JSON '
+            'baseline; the command fails when throughput or p95 latency regresses beyond --threshold.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1,
+                            help=f'Dataset size: {SCALE_USERS} users and {SCALE_BOOKINGS} bookings per step.')
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per scenario and driver.')
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+        parser.add_argument('--drivers', default=','.join(DRIVERS))
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                            help='Baseline JSON; baselines are machine-specific, keep one per machine.')
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline.')
+        parser.add_argument('--output', default=None, help='Also write the results to this JSON file.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Allowed fractional drop in throughput / rise in p95 before failing.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        scenarios = [name for name in options['scenarios'].split(',') if name]
+        drivers = [name for name in options['drivers'].split(',') if name]
+        unknown = set(scenarios) - set(SCENARIOS) | set(drivers) - set(DRIVERS)
+        if unknown:
+            raise CommandError(f'Unknown scenario/driver: {", ".join(sorted(unknown))}')
+
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0)
+        old_config = runner.setup_databases()
+        try:
+            # Benchmarks measure the request path only: no inline outbox
+            # worker thread, no debug headers, no per-request query log lines.
+            query_log = logging.getLogger('api.queries')
+            level = query_log.level
+            query_log.setLevel(logging.WARNING)
+            with override_settings(NOTIFICATION_OUTBOX={'INLINE_WORKER': False}, QUERY_COUNT_HEADERS=False):
+                results = self.run_benchmarks(scenarios, drivers, options)
+        finally:
+            query_log.setLevel(level)
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'database': connection.vendor,
+                'scale': options['scale'],
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }
+        if options['output']:
+            self.write_json(options['output'], report)
+        if options['save_baseline']:
+            self.write_json(options['baseline'], report)
+            self.stdout.write(f"Baseline saved to {options['baseline']}")
+            return
+
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save-baseline to record one.")
+            return
+        with open(options['baseline'], encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('database') != connection.vendor:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded on {baseline['meta'].get('database')}, this run is on {connection.vendor}"
+            ))
+        regressions = find_regressions(baseline['results'], results, options['threshold'])
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%} of the baseline"))
+
+    def run_benchmarks(self, scenarios, drivers, options):
+        started = time.perf_counter()
+        call_command(
+            'generate_dataset', users=SCALE_USERS * options['scale'], bookings=SCALE_BOOKINGS * options['scale'],
+            providers=5, workers=1, seed=options['seed'], stdout=StringIO(),
+        )
+        self.stdout.write(f'Dataset generated in {time.perf_counter() - started:.1f}s')
+        fixture = Fixture(options['seed'])
+
+        results = {}
+        for driver_name in drivers:
+            driver_class = ClientDriver if driver_name == 'client' else AsgiDriver
+            with driver_class() as driver:
+                # Importing the ASGI app re-runs logging setup
+                logging.getLogger('api.queries').setLevel(logging.WARNING)
+                for scenario in scenarios:
+                    expected = 201 if scenario == 'booking_create' else 200
+
+                    def call(worker):
+                        return driver.send(*fixture.request(scenario, worker)) == expected
+
+                    run_concurrent(call, options['warmup'], options['concurrency'])
+                    summary = summarize(*run_concurrent(call, options['requests'], options['concurrency']))
+                    results.setdefault(driver_name, {})[scenario] = summary
+                    self.stdout.write(
+                        f"{driver_name:7} {scenario:15} {summary['throughput_rps']:8.1f} req/s  "
+                        f"p50 {summary['p50_ms']:7.1f}  p95 {summary['p95_ms']:7.1f}  p99 {summary['p99_ms']:7.1f} ms  "
+                        f"errors {summary['errors']}"
+                    )
+        return results
+
+    def write_json(self, path, data):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
@@ -0,0 +1,107 @@
+import random
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api import repository
+from api.models import Booking, Notification, Service
+from api.mongo import is_mongo
+
+# Queries without an order_by come back in natural order on both paths; they
+# are compared as sorted lists so a storage-order difference is not a failure.
+UNORDERED = {'booked_slots', 'booked_slot_rows', 'user_bookings', 'user_notifications (no order)'}
+
+
+def sort_key(item):
+    return (item.get('id'), repr(item)) if isinstance(item, dict) else (0, repr(item))
+
+
+class Command(BaseCommand):
+    help = ('Check that the pymongo fast path (api/repository.py) returns exactly what the ORM path returns, '
+            'on a generated dataset in a test database or, with --live, read-only on the configured database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--live', action='store_true',
+                            help='Compare on the configured database instead of a generated test dataset.')
+        parser.add_argument('--samples', type=int, default=50, help='Users, services and days sampled per check.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not is_mongo():
+            raise CommandError(f'The fast path only runs on djongo (MongoDB) databases, not {connection.vendor}')
+
+        if options['live']:
+            mismatches = self.run_checks(options)
+        else:
+            setup_test_environment()
+            runner = DiscoverRunner(verbosity=0)
+            old_config = runner.setup_databases()
+            try:
+                call_command('generate_dataset', users=300, bookings=6000, providers=3, workers=1,
+                             seed=options['seed'], stdout=StringIO())
+                mismatches = self.run_checks(options)
+            finally:
+                runner.teardown_databases(old_config)
+                teardown_test_environment()
+
+        if mismatches:
+            raise CommandError(f'{mismatches} fast path result(s) differ from the ORM')
+        self.stdout.write(self.style.SUCCESS('The fast path matches the ORM on every sampled query'))
+
+    def cases(self, rng, samples):
+        """(check name, repository function, kwargs) for every sampled query."""
+        def sample(values):
+            values = sorted(set(values))
+            return rng.sample(values, min(samples, len(values)))
+
+        service_ids = list(Service.objects.values_list('id', flat=True))
+        days = sample(Booking.objects.values_list('date', flat=True)[:5000])
+        booking_users = sample(Booking.objects.values_list('user_id', flat=True)[:5000])
+        notifications = list(Notification.objects.values_list('user_id', 'id', 'created_at')[:5000])
+        notification_users = sample(user_id for user_id, _, _ in notifications)
+        if not service_ids or not days or not notification_users:
+            raise CommandError('Not enough bookings and notifications to compare; run generate_dataset first')
+
+        for day in days:
+            yield 'booked_slots', repository.booked_slots, {'service_id': rng.choice(service_ids), 'day': day}
+            yield 'booked_slot_rows', repository.booked_slot_rows, {
+                'service_ids': rng.sample(service_ids, min(3, len(service_ids))),
+                'start': day, 'end': day + timedelta(days=6),
+            }
+        for user_id in booking_users:
+            yield 'user_bookings', repository.user_bookings, {'user_id': user_id}
+        for user_id in notification_users:
+            _, since_id, since = rng.choice([row for row in notifications if row[0] == user_id])
+            yield 'user_notifications (no order)', repository.user_notifications, {'user_id': user_id}
+            yield 'user_notifications', repository.user_notifications, {'user_id': user_id, 'order': ('-created_at',)}
+            yield 'user_notifications', repository.user_notifications, {
+                'user_id': user_id, 'order': ('-created_at', '-id'), 'limit': 5,
+            }
+            yield 'user_notifications', repository.user_notifications, {
+                'user_id': user_id, 'since_id': since_id, 'order': ('id',),
+            }
+            yield 'user_notifications', repository.user_notifications, {
+                'user_id': user_id, 'since': since, 'order': ('id',),
+            }
+            yield 'unread_notification_count', repository.unread_notification_count, {'user_id': user_id}
+
+    def run_checks(self, options):
+        checked, mismatches = {}, 0
+        for name, function, kwargs in self.cases(random.Random(options['seed']), options['samples']):
+            expected, actual = function(fast=False, **kwargs), function(fast=True, **kwargs)
+            if name in UNORDERED:
+                expected, actual = sorted(expected, key=sort_key), sorted(actual, key=sort_key)
+            checked[name] = checked.get(name, 0) + 1
+            if expected != actual:
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(f'MISMATCH {name} {kwargs}'))
+                self.stdout.write(f'  orm:  {expected!r:.300}')
+                self.stdout.write(f'  fast: {actual!r:.300}')
+        for name, count in checked.items():
+            self.stdout.write(f'{name:32} {count:5d} queries compared')
+        return mismatches
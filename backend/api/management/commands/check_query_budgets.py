@@ -0,0 +1,212 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from api.authentication import tokens_for_user
+from api.counters import reconcile
+from api.middleware import QueryStats
+from api.occupancy import occupancy_index
+from api.service_names import service_names
+from api.models import (
+    Booking, Notification, Service, ServiceProvider, ServiceProviderService, User,
+)
+
+# Rows created per list so an N+1 regression shows up as ~ROWS extra queries.
+ROWS = 10
+
+# Chat turns that need the LLM are answered by the offline stub, without delay.
+STUB_LLM = dict(settings.AI_LLM, BACKEND='AI.stub.StubBackend', STUB={'LATENCY_MS': 0, 'JITTER_MS': 0})
+
+# The occupancy index polls for other processes' changes once per interval,
+# not per request; keep that poll out of the measured cases.
+STEADY_OCCUPANCY = {'POLL_INTERVAL': 3600, 'MAX_AGE': 3600}
+
+# (route, method, role, path, body, expected status, query budget). Every
+# route in api/urls.py and AI/urls.py must appear here; a case fails on any
+# other status, so an error path cannot pass for the endpoint. Budgets include the JWT user lookup on
+# writes; reads authenticate from the token claims (api/authentication.py).
+# Booking writes include the slot change record (api/occupancy.py); availability
+# reads of a loaded day take none.
+# Destructive calls come last so earlier cases see the full fixture.
+CASES = [
+    ('api/auth/register', 'post', None, '/api/auth/register',
+     {'email': 'new@example.com', 'password': 'pw-12345', 'username': 'new', 'room_number': '9'}, 201, 3),
+    ('api/auth/login', 'post', None, '/api/auth/login', {'email': 'student@example.com', 'password': 'pw'}, 200, 1),
+    ('api/auth/profile', 'get', 'student', '/api/auth/profile', None, 200, 0),
+    ('api/services', 'get', None, '/api/services', None, 200, 1),
+    ('api/bookings', 'post', 'student', '/api/bookings',
+     {'service_id': '{service}', 'date': '{future}', 'time_slot': '16:00-18:00'}, 201, 8),
+    ('api/bookings/batch', 'post', 'student', '/api/bookings/batch',
+     {'service_id': '{service}', 'time_slot': '12:00-14:00', 'recurrence': {'start': '{future}', 'count': ROWS}}, 201, 11),
+    ('api/bookings/my', 'get', 'student', '/api/bookings/my', None, 200, 1),
+    ('api/bookings/availability', 'get', 'student', '/api/bookings/availability?service_id={service}&date={future}', None, 200, 0),
+    ('api/bookings/availability/matrix', 'get', 'student',
+     '/api/bookings/availability/matrix?service_ids={service}&start=today&end={future}', None, 200, 1),
+    ('api/bookings/<int:booking_id>/reschedule', 'put', 'student', '/api/bookings/{booking}/reschedule',
+     {'date': '{future}', 'time_slot': '14:00-16:00'}, 200, 5),
+    ('api/bookings/<int:booking_id>/rate', 'post', 'student', '/api/bookings/{booking}/rate', {'rating': 5}, 200, 3),
+    ('api/bookings/<int:booking_id>/ask-if-completed/', 'post', 'student',
+     '/api/bookings/{booking}/ask-if-completed/', None, 200, 4),
+    ('api/stats/dashboard', 'get', 'student', '/api/stats/dashboard', None, 200, 1),
+    ('api/student/notifications', 'get', 'student', '/api/student/notifications', None, 200, 1),
+    ('api/admin/bookings', 'get', 'admin', '/api/admin/bookings', None, 200, 1),
+    ('api/admin/users', 'get', 'admin', '/api/admin/users', None, 200, 1),
+    ('api/admin/service-providers', 'get', 'admin', '/api/admin/service-providers', None, 200, 3),
+    ('api/admin/service-providers/create', 'post', 'admin', '/api/admin/service-providers/create',
+     {'name': 'fixer', 'email': 'fixer@example.com', 'phone': '1', 'specialization': 'x', 'services': [4]}, 201, 9),
+    ('api/admin/service-providers/<str:provider_id>', 'put', 'admin', '/api/admin/service-providers/{provider}',
+     {'name': 'prov', 'email': 'provider@example.com', 'phone': '2', 'specialization': 'y', 'user': '{provider_user}',
+      'service_ids': ['{service}']}, 200, 7),
+    ('api/service-provider/profile', 'get', 'provider', '/api/service-provider/profile', None, 200, 1),
+    ('api/service-provider/bookings', 'get', 'provider', '/api/service-provider/bookings', None, 200, 2),
+    ('api/service-provider/calendar', 'get', 'provider', '/api/service-provider/calendar?week={future}', None, 200, 2),
+    ('api/service-provider/bookings/<int:booking_id>/status', 'put', 'provider',
+     '/api/service-provider/bookings/{booking}/status', {'status': 'completed'}, 200, 4),
+    ('api/service-provider/bookings/<int:booking_id>/notify-completion', 'post', 'provider',
+     '/api/service-provider/bookings/{booking}/notify-completion', {'message': 'done'}, 200, 5),
+    ('api/service-provider/notifications', 'get', 'provider', '/api/service-provider/notifications', None, 200, 1),
+    ('api/service-provider/notifications/read', 'put', 'provider', '/api/service-provider/notifications/read',
+     {'up_to': 1000000}, 200, 2),
+    ('api/service-provider/notifications/<int:notification_id>/read', 'put', 'provider',
+     '/api/service-provider/notifications/{provider_notification}/read', None, 200, 3),
+    ('api/notifications/user', 'get', 'student', '/api/notifications/user', None, 200, 1),
+    ('api/notifications/unread-count', 'get', 'student', '/api/notifications/unread-count', None, 200, 1),
+    ('api/notifications/read', 'put', 'student', '/api/notifications/read', {'ids': ['{notification}']}, 200, 2),
+    ('api/notifications/<int:notification_id>/read', 'put', 'student',
+     '/api/notifications/{notification}/read', None, 200, 3),
+    ('api/notifications/booking/<int:booking_id>', 'post', 'student', '/api/notifications/booking/{booking}', None, 200, 4),
+    # A turn the local parser answers, then one that goes to the (stub) LLM
+    ('ai/chat/', 'post', None, '/ai/chat/', {'user_message': 'Book laundry tomorrow at 10 AM'}, 200, 0),
+    ('ai/chat/', 'post', None, '/ai/chat/', {'user_message': 'My roommate needs help with something'}, 200, 0),
+    ('ai/chat/cache-stats/', 'get', 'admin', '/ai/chat/cache-stats/', None, 200, 0),
+    ('ai/services/by-name/<str:name>/', 'get', None, '/ai/services/by-name/laundry/', None, 200, 1),
+    ('api/bookings/<int:booking_id>/cancel', 'put', 'student', '/api/bookings/{booking}/cancel', None, 200, 3),
+    ('api/bookings/<int:booking_id>/delete', 'delete', 'student', '/api/bookings/{spare_booking}/delete', None, 200, 7),
+    ('api/admin/service-providers/<str:provider_id>/delete/', 'delete', 'admin',
+     '/api/admin/service-providers/{spare_provider}/delete/', None, 204, 5),
+]
+
+
+def iter_routes(resolver, prefix=''):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern)
+
+
+def build_fixture():
+    slots = [slot for slot, _ in Booking.SERVICE_TIMES]
+    admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+    student = User.objects.create_user(username='student', email='student@example.com', password='pw', room_number='101')
+    provider_user = User.objects.create_user(username='prov', email='provider@example.com', password='pw',
+                                             is_serviceprovider=True)
+    provider = ServiceProvider.objects.create(user=provider_user, name='prov', email='provider@example.com',
+                                              phone='1', specialization='laundry')
+    service = Service.objects.create(name='Laundry', price=100)
+    ServiceProviderService.objects.create(serviceprovider=provider, service=service)
+
+    bookings = [
+        Booking.objects.create(user=student, service=service, date=date.today() + timedelta(days=1 + i // len(slots)),
+                               time_slot=slots[i % len(slots)])
+        for i in range(ROWS)
+    ]
+    spare_booking = Booking.objects.create(user=student, service=service, date=date.today() + timedelta(days=30),
+                                           time_slot=slots[0])
+    notifications = [Notification.objects.create(user=student, message=f'note {i}') for i in range(ROWS)]
+    provider_notifications = [Notification.objects.create(user=provider_user, message=f'note {i}') for i in range(ROWS)]
+
+    spare_user = User.objects.create_user(username='spare', email='spare@example.com', password='pw',
+                                          is_serviceprovider=True)
+    spare_provider = ServiceProvider.objects.create(user=spare_user, name='spare', email='spare@example.com',
+                                                    phone='1', specialization='x')
+
+    # Steady state: the dashboard counters exist, the name index is loaded and
+    # the occupancy index has polled once and holds the booked day.
+    reconcile()
+    service_names.load()
+    occupancy_index.clear()
+    occupancy_index.get_mask(service.id, date.today() + timedelta(days=3))
+
+    users = {'admin': admin, 'student': student, 'provider': provider_user}
+    ids = {
+        'service': service.id,
+        'booking': bookings[0].id,
+        'spare_booking': spare_booking.id,
+        'provider': provider.id,
+        'provider_user': provider_user.id,
+        'spare_provider': spare_provider.id,
+        'notification': notifications[0].id,
+        'provider_notification': provider_notifications[0].id,
+        'future': (date.today() + timedelta(days=3)).isoformat(),
+    }
+    return users, ids
+
+
+def fill(value, ids):
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, list):
+        return [fill(v, ids) for v in value]
+    if isinstance(value, dict):
+        return {k: fill(v, ids) for k, v in value.items()}
+    return value
+
+
+class Command(BaseCommand):
+    help = ('Run every API endpoint against a test database and fail if any returns an unexpected status '
+            'or exceeds its query budget.')
+
+    def handle(self, *args, **options):
+        budgeted = {case[0] for case in CASES}
+        unbudgeted = [route for route in iter_routes(get_resolver())
+                      if route.startswith(('api/', 'ai/')) and route not in budgeted]
+        if unbudgeted:
+            raise CommandError('Endpoints without a query budget: ' + ', '.join(unbudgeted))
+
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(NOTIFICATION_OUTBOX={'INLINE_WORKER': False}, AI_LLM=STUB_LLM,
+                                   OCCUPANCY_INDEX=STEADY_OCCUPANCY):
+                failures = self.run_cases()
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if failures:
+            raise CommandError(f'{len(failures)} endpoint(s) over budget or failing: ' + ', '.join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f'All {len(CASES)} cases returned the expected status within their query budgets'
+        ))
+
+    def run_cases(self):
+        users, ids = build_fixture()
+        tokens = {role: str(tokens_for_user(user).access_token) for role, user in users.items()}
+        failures = []
+        for route, method, role, path, body, expected, budget in CASES:
+            client = APIClient(raise_request_exception=False)
+            if role:
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens[role]}')
+            stats = QueryStats()
+            with connection.execute_wrapper(stats):
+                response = getattr(client, method)(fill(path, ids), fill(body, ids), format='json')
+            label = 'ok  '
+            if response.status_code != expected:
+                label = 'FAIL'
+            elif stats.count > budget:
+                label = 'OVER'
+            if label != 'ok  ':
+                failures.append(route)
+            self.stdout.write(
+                f'{label} {method.upper():6} {route:70} '
+                f'{response.status_code}/{expected} {stats.count:3d}/{budget} queries'
+            )
+        return failures
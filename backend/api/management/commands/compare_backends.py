@@ -0,0 +1,97 @@
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Run benchmark_api once per DATABASE_PROFILE, each in its own process, and compare the hot '
+            'endpoints across backends. Profiles whose database is unreachable are reported and skipped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default=','.join(settings.DATABASE_PROFILES))
+        parser.add_argument('--scale', type=int, default=1)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--scenarios', default=None, help='Passed to benchmark_api.')
+        parser.add_argument('--drivers', default=None, help='Passed to benchmark_api.')
+        parser.add_argument('--output', default=None, help='Write every profile\'s results to this JSON file.')
+
+    def handle(self, *args, **options):
+        profiles = [name for name in options['profiles'].split(',') if name]
+        unknown = set(profiles) - set(settings.DATABASE_PROFILES)
+        if unknown:
+            raise CommandError(f'Unknown profile: {", ".join(sorted(unknown))}')
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for profile in profiles:
+                self.stdout.write(f'== {profile}')
+                report = self.run_profile(profile, tmp, options)
+                if report is not None:
+                    results[profile] = report
+        if not results:
+            raise CommandError('No profile could be benchmarked')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+                f.write('\n')
+        self.print_comparison(results)
+
+    def run_profile(self, profile, tmp, options):
+        output = os.path.join(tmp, f'{profile}.json')
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'benchmark_api',
+            '--scale', str(options['scale']), '--requests', str(options['requests']),
+            '--concurrency', str(options['concurrency']), '--output', output,
+            # A throwaway baseline path: this run compares backends, not history
+            '--baseline', os.path.join(tmp, 'no-baseline.json'),
+        ]
+        for option in ('scenarios', 'drivers'):
+            if options[option]:
+                command += [f'--{option}', options[option]]
+        completed = subprocess.run(
+            command, env={**os.environ, 'DATABASE_PROFILE': profile}, capture_output=True, text=True,
+        )
+        if completed.returncode != 0 or not os.path.exists(output):
+            reason = (completed.stderr.strip() or completed.stdout.strip() or 'no output').splitlines()[-1]
+            self.stdout.write(self.style.WARNING(f'   skipped: {reason}'))
+            return None
+        self.stdout.write(completed.stdout.rstrip())
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+
+    def print_comparison(self, results):
+        profiles = list(results)
+        self.stdout.write('\nthroughput req/s (p95 ms)')
+        self.stdout.write(f"{'':24}" + ''.join(f'{profile:>22}' for profile in profiles))
+        rows = sorted({(driver, scenario) for report in results.values()
+                       for driver, scenarios in report['results'].items() for scenario in scenarios})
+        for driver, scenario in rows:
+            cells = []
+            for profile in profiles:
+                summary = results[profile]['results'].get(driver, {}).get(scenario)
+                cells.append(f"{summary['throughput_rps']:9.1f} ({summary['p95_ms']:7.1f})" if summary else '-')
+            self.stdout.write(f'{driver + "/" + scenario:24}' + ''.join(f'{cell:>22}' for cell in cells))
+
+        # Rank on the scenarios every profile ran, by geometric mean throughput
+        common = [row for row in rows if all(row[1] in results[p]['results'].get(row[0], {}) for p in profiles)]
+        if not common:
+            return
+        scores = {
+            profile: math.exp(sum(
+                math.log(max(results[profile]['results'][driver][scenario]['throughput_rps'], 0.1))
+                for driver, scenario in common
+            ) / len(common))
+            for profile in profiles
+        }
+        fastest = max(scores, key=scores.get)
+        self.stdout.write(self.style.SUCCESS(
+            f'\nFastest: {fastest} (geometric mean {scores[fastest]:.1f} req/s over {len(common)} scenarios)'
+        ))
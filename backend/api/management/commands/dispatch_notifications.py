@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.outbox import dispatch_pending, outbox_setting
+
+
+class Command(BaseCommand):
+    help = 'Expand pending notification outbox events into provider notifications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the outbox is empty.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Notifications per bulk insert.')
+
+    def handle(self, *args, **options):
+        interval = outbox_setting('POLL_INTERVAL')
+        while True:
+            events, sent = dispatch_pending(batch_size=options['batch_size'])
+            if events:
+                self.stdout.write(f'Dispatched {events} event(s), {sent} notification(s)')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(interval)
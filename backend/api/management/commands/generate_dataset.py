@@ -0,0 +1,359 @@
+import heapq
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from api.counters import reconcile
+from api.models import Booking, Notification, Service, ServiceProvider, ServiceProviderService, User
+from api.occupancy import record_changes
+from api.service_names import PREDEFINED_SERVICES
+
+# Generated rows are tagged so --clear can remove exactly them
+EMAIL_DOMAIN = 'loadtest.example'
+SERVICE_PREFIX = 'Load Test Service'
+
+# Share of (service, day, slot) cells booked when --services is not given,
+# and the most that still leaves a realistic spread
+DEFAULT_FILL = 0.4
+MAX_FILL = 0.7
+
+# Relative demand
+SLOT_WEIGHTS = [0.6, 1.0, 0.8, 1.2, 1.4]          # Booking.SERVICE_TIMES order
+WEEKDAY_WEIGHTS = [1.1, 1.0, 1.0, 1.0, 0.9, 1.3, 1.2]  # Monday first
+
+MESSAGES = [
+    'Your booking for {service} on {date} is confirmed.',
+    'Reminder: {service} is scheduled for {date}.',
+    'Your {service} booking on {date} has been completed. Please rate it.',
+    'Your {service} booking on {date} was rescheduled.',
+]
+
+
+@contextmanager
+def explicit_created_at():
+    # bulk_create would otherwise stamp every notification with now()
+    field = Notification._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def demand_trend(day, today, history_days):
+    """Demand grows towards the present: 0.6 at the oldest day, 1.0 today, up to 1.4 ahead."""
+    return 0.6 + 0.4 * min(2.0, max(0.0, 1 + (day - today).days / max(1, history_days)))
+
+
+def init_worker():
+    # Each worker opens its own connections instead of reusing the parent's.
+    connections.close_all()
+
+
+def create_users(start, end, password, batch_size):
+    users = [
+        User(
+            username=f'lt_user{n}',
+            email=f'user{n}@{EMAIL_DOMAIN}',
+            name=f'Student {n}',
+            room_number=str(100 + n % 900),
+            password=password,
+        )
+        for n in range(start, end)
+    ]
+    User.objects.bulk_create(users, batch_size=batch_size)
+    return len(users)
+
+
+def day_weight(day, today, history_days):
+    return WEEKDAY_WEIGHTS[day.weekday()] * demand_trend(day, today, history_days)
+
+
+def create_bookings(first_day, last_day, quota, services, user_ids, today, history_days, seed, batch_size):
+    """
+    Book `quota` distinct free (service, day, slot) cells of [first_day,
+    last_day], drawn without replacement with probability proportional to
+    day x service x slot weight (Efraimidis-Spirakis keys). Cells that are
+    already booked (earlier runs, real data) are skipped; fewer than `quota`
+    are created only when the range runs out of free cells. Workers get
+    disjoint date ranges, so they never race on the unique constraint.
+    Returns the number created.
+    """
+    rng = random.Random(seed)
+    slots = list(zip([slot for slot, _ in Booking.SERVICE_TIMES], SLOT_WEIGHTS))
+    taken = set(Booking.objects.filter(
+        service_id__in=[service_id for service_id, _ in services], date__gte=first_day, date__lte=last_day,
+    ).values_list('service_id', 'date', 'time_slot'))
+
+    def cells():
+        day = first_day
+        while day <= last_day:
+            weight = day_weight(day, today, history_days)
+            for service_id, service_weight in services:
+                for slot, slot_weight in slots:
+                    if (service_id, day, slot) not in taken:
+                        yield rng.random() ** (1 / (weight * service_weight * slot_weight)), day, service_id, slot
+            day += timedelta(days=1)
+
+    batch, created = [], 0
+    for _, day, service_id, slot in heapq.nlargest(quota, cells()):
+        status, rating = 'Booked', None
+        if day < today:
+            status = rng.choices(['completed', 'Cancelled', 'Booked'], [0.8, 0.1, 0.1])[0]
+            if status == 'completed' and rng.random() < 0.4:
+                rating = rng.choices([1, 2, 3, 4, 5], [0.05, 0.05, 0.15, 0.35, 0.4])[0]
+        batch.append(Booking(
+            user_id=rng.choice(user_ids), service_id=service_id, date=day, time_slot=slot,
+            status=status, rating=rating,
+        ))
+        if len(batch) >= batch_size:
+            insert_bookings(batch)
+            created += len(batch)
+            batch = []
+    insert_bookings(batch)
+    return created + len(batch)
+
+
+def insert_bookings(batch):
+    Booking.objects.bulk_create(batch)
+    # bulk_create skips the booking signals; a running server must still see these days change.
+    record_changes({(booking.service_id, booking.date) for booking in batch})
+
+
+def split_quota(total, weights):
+    """Integer shares of `total` proportional to `weights` (largest remainder)."""
+    exact = [total * w / sum(weights) for w in weights]
+    shares = [int(x) for x in exact]
+    by_remainder = sorted(range(len(weights)), key=lambda i: exact[i] - shares[i], reverse=True)
+    for i in by_remainder[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def create_notifications(user_ids, per_user, service_names, days, seed, batch_size):
+    rng = random.Random(seed)
+    now = timezone.now()
+    batch, created = [], 0
+    with explicit_created_at():
+        for user_id in user_ids:
+            for _ in range(rng.randint(0, per_user * 2)):
+                age = timedelta(days=rng.expovariate(1 / max(1, days / 6)), seconds=rng.randint(0, 86400))
+                age = min(age, timedelta(days=days))
+                batch.append(Notification(
+                    user_id=user_id,
+                    message=rng.choice(MESSAGES).format(
+                        service=rng.choice(service_names), date=(now - age).date().isoformat()
+                    ),
+                    created_at=now - age,
+                    # Older notifications have mostly been read
+                    read=age > timedelta(days=2) and rng.random() < 0.9,
+                ))
+                if len(batch) >= batch_size:
+                    Notification.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+        Notification.objects.bulk_create(batch)
+    return created + len(batch)
+
+
+def chunks(items, count):
+    size = math.ceil(len(items) / count)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class Command(BaseCommand):
+    help = ('Generate a production-sized synthetic dataset (users, services, providers, bookings, '
+            'notifications) with bulk inserts in parallel worker processes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--services', type=int, default=None,
+                            help='Total services; beyond the predefined ones, numbered services are added. '
+                                 'Defaults to enough to hold --bookings.')
+        parser.add_argument('--providers', type=int, default=10)
+        parser.add_argument('--bookings', type=int, default=10000, help='Bookings to create; fewer only if the free slots run out (the real count is reported).')
+        parser.add_argument('--notifications-per-user', type=int, default=5, help='Average per user.')
+        parser.add_argument('--days', type=int, default=365, help='Days of booking history before today.')
+        parser.add_argument('--future-days', type=int, default=30)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='loadtest', help='Password of every generated account.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if connection.vendor == 'sqlite' and workers > 1:
+            self.stdout.write('SQLite allows a single writer; using 1 worker.')
+            workers = 1
+        self.batch_size = options['batch_size']
+        self.seed = options['seed']
+
+        if options['clear']:
+            self.clear()
+
+        today = date.today()
+        first_day = today - timedelta(days=options['days'])
+        last_day = today + timedelta(days=options['future_days'])
+        days = (last_day - first_day).days + 1
+
+        cells_per_service = days * len(Booking.SERVICE_TIMES)
+        total_services = options['services'] or max(
+            len(PREDEFINED_SERVICES) - 1, math.ceil(options['bookings'] / (cells_per_service * DEFAULT_FILL))
+        )
+        # Slots already booked on these services (earlier runs, real data) are not free
+        already_booked = Booking.objects.filter(
+            service__name__in=self.service_names(total_services), date__gte=first_day, date__lte=last_day,
+        ).count()
+        fill = (options['bookings'] + already_booked) / (total_services * cells_per_service)
+        if fill > MAX_FILL:
+            raise CommandError(
+                f'{options["bookings"]} bookings (plus {already_booked} existing) do not fit {total_services} '
+                f'services x {days} days x {len(Booking.SERVICE_TIMES)} slots without saturating them; '
+                f'raise --services or --days, or pass --clear.'
+            )
+        services = self.phase('services', lambda: self.create_services(total_services))
+
+        # One hash for every account instead of a PBKDF2 run per user
+        password = make_password(options['password'])
+        existing = User.objects.filter(email__endswith='@' + EMAIL_DOMAIN).count()
+
+        # Worker processes must not inherit this process's open connections.
+        connections.close_all()
+        with self.pool(workers) as pool:
+            starts = list(range(existing, existing + options['users'], self.batch_size))
+            ends = [min(start + self.batch_size, existing + options['users']) for start in starts]
+            self.phase('users', lambda: sum(pool.map(
+                create_users, starts, ends, [password] * len(starts), [self.batch_size] * len(starts),
+            )))
+            user_ids = list(User.objects.filter(email__endswith='@' + EMAIL_DOMAIN).values_list('id', flat=True))
+            if not user_ids:
+                raise CommandError('No generated users to attach bookings to; pass --users.')
+
+            self.phase('providers', lambda: self.create_providers(options['providers'], services, password))
+
+            rng = random.Random(self.seed)
+            order = list(services)
+            rng.shuffle(order)
+            # Zipf-like popularity: a few services take most of the demand
+            weights = [1 / (rank + 1) ** 0.8 for rank in range(len(order))]
+            service_weights = list(zip(order, weights))
+            span = math.ceil(days / max(1, workers * 4))
+            ranges = [(first_day + timedelta(days=i), min(last_day, first_day + timedelta(days=i + span - 1)))
+                      for i in range(0, days, span)]
+            quotas = split_quota(options['bookings'], [
+                sum(day_weight(start + timedelta(days=d), today, options['days'])
+                    for d in range((end - start).days + 1))
+                for start, end in ranges
+            ])
+            self.phase('bookings', lambda: sum(pool.map(
+                create_bookings,
+                [start for start, _ in ranges], [end for _, end in ranges], quotas,
+                [service_weights] * len(ranges), [user_ids] * len(ranges),
+                [today] * len(ranges), [options['days']] * len(ranges),
+                [self.seed + i for i in range(len(ranges))], [self.batch_size] * len(ranges),
+            )))
+
+            names = list(Service.objects.filter(id__in=services).values_list('name', flat=True))
+            parts = chunks(user_ids, workers * 4)
+            self.phase('notifications', lambda: sum(pool.map(
+                create_notifications,
+                parts, [options['notifications_per_user']] * len(parts), [names] * len(parts),
+                [options['days']] * len(parts), [self.seed + i for i in range(len(parts))],
+                [self.batch_size] * len(parts),
+            )))
+
+        # bulk_create sends no signals; rebuild the dashboard counters.
+        self.phase('counters', reconcile)
+
+    @contextmanager
+    def pool(self, workers):
+        if workers <= 1:
+            yield InlinePool()
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            yield pool
+
+    def phase(self, name, action):
+        started = time.perf_counter()
+        result = action()
+        elapsed = time.perf_counter() - started
+        count = len(result) if isinstance(result, list) else result
+        rate = f' ({count / elapsed:,.0f}/s)' if elapsed > 0 and count else ''
+        self.stdout.write(f'{name:14} {count:>12,} in {elapsed:7.2f}s{rate}')
+        return result
+
+    def service_names(self, total):
+        names = [name for name in PREDEFINED_SERVICES.values() if name != 'AI Booking Assistant'][:total]
+        return names + [f'{SERVICE_PREFIX} {n:04d}' for n in range(1, total - len(names) + 1)]
+
+    def create_services(self, total):
+        names = self.service_names(total)
+        existing = dict(Service.objects.filter(name__in=names).values_list('name', 'id'))
+        Service.objects.bulk_create(
+            [Service(name=name, description='Generated for load testing.', price=random.Random(name).choice(
+                [50, 75, 100, 150]), duration='2 hours', availability=True) for name in names if name not in existing],
+            batch_size=self.batch_size,
+        )
+        return list(Service.objects.filter(name__in=names).values_list('id', flat=True))
+
+    def create_providers(self, total, services, password):
+        rng = random.Random(self.seed)
+        start = ServiceProvider.objects.filter(email__endswith='@' + EMAIL_DOMAIN).count()
+        users = [
+            User(username=f'lt_provider{n}', email=f'provider{n}@{EMAIL_DOMAIN}', password=password,
+                 is_serviceprovider=True)
+            for n in range(start, start + total)
+        ]
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        user_ids = dict(User.objects.filter(email__in=[u.email for u in users]).values_list('email', 'id'))
+        ServiceProvider.objects.bulk_create([
+            ServiceProvider(user_id=user_ids[u.email], name=u.username, email=u.email,
+                            phone=f'555{rng.randint(1000000, 9999999)}', specialization='General')
+            for u in users
+        ], batch_size=self.batch_size)
+        providers = ServiceProvider.objects.filter(email__in=[u.email for u in users]).values_list('id', flat=True)
+        ServiceProviderService.objects.bulk_create([
+            ServiceProviderService(serviceprovider_id=provider_id, service_id=service_id)
+            for provider_id in providers
+            for service_id in rng.sample(services, min(len(services), rng.randint(1, 3)))
+        ], batch_size=self.batch_size)
+        return total
+
+    def clear(self):
+        started = time.perf_counter()
+        generated_users = User.objects.filter(email__endswith='@' + EMAIL_DOMAIN)
+        bookings = [
+            Booking.objects.filter(user__in=generated_users),
+            Booking.objects.filter(service__name__startswith=SERVICE_PREFIX),
+        ]
+        days = set()
+        for queryset in bookings:
+            days.update(queryset.values_list('service_id', 'date').distinct())
+        # Raw deletes skip the per-row signals (and loading every row); their
+        # side effects are applied once below.
+        for queryset in bookings:
+            queryset._raw_delete(queryset.db)
+        notifications = Notification.objects.filter(user__in=generated_users)
+        notifications._raw_delete(notifications.db)
+        record_changes(days)
+        reconcile()
+        generated_users.delete()
+        Service.objects.filter(name__startswith=SERVICE_PREFIX).delete()
+        self.stdout.write(f'{"cleared":14} {"":>12} in {time.perf_counter() - started:7.2f}s')
+
+
+class InlinePool:
+    """Runs pool.map work in this process (one worker, or SQLite)."""
+
+    def map(self, fn, *iterables):
+        return [fn(*args) for args in zip(*iterables)]
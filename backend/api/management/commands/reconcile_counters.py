@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the dashboard counters from the bookings and services collections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every N seconds instead of running once.')
+
+    def handle(self, *args, **options):
+        while True:
+            changed = reconcile()
+            self.stdout.write(f'Reconciled counters, {changed} corrected')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger('api.queries')
+
+# Stats of the request being handled. A context variable rather than a
+# thread-local, so queries that async views run through sync_to_async threads
+# are still attributed to their request.
+current_stats = ContextVar('query_stats', default=None)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def record_query(execute, sql, params, many, context):
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def install_on_new_connection(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+class QueryCountMiddleware(MiddlewareMixin):
+    """
+    Count the database queries and DB time of every request. The totals are
+    logged to `api.queries` and, when QUERY_COUNT_HEADERS is on (defaults to
+    DEBUG), returned as X-DB-Query-Count / X-DB-Time-Ms headers.
+
+    Async-capable so async views (AI chat) keep a fully async handler chain
+    under ASGI.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.add_headers = getattr(settings, 'QUERY_COUNT_HEADERS', settings.DEBUG)
+        for connection in connections.all():
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        db_ms = stats.duration * 1000
+        logger.info('%s %s: %d queries, %.1f ms DB', request.method, request.path, stats.count, db_ms)
+        if self.add_headers:
+            response['X-DB-Query-Count'] = str(stats.count)
+            response['X-DB-Time-Ms'] = f'{db_ms:.1f}'
+        return response
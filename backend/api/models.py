@@ -50,7 +50,12 @@ class Booking(models.Model):
         return f"{self.user} - {self.service} - {self.date}"
     
     class Meta:
+        # Also serves (service, date) lookups: availability, calendars, batch checks
         unique_together = ('service', 'date', 'time_slot')
+        indexes = [
+            # "My bookings" and per-user history by date
+            models.Index(fields=['user', 'date'], name='booking_user_date_idx'),
+        ]
 
 # models.py
 
@@ -79,6 +84,61 @@ class Notification(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
+    # The outbox event this was fanned out from, so a retried dispatch skips
+    # the providers it already reached
+    event = models.ForeignKey('NotificationOutbox', null=True, blank=True, on_delete=models.SET_NULL,
+                              related_name='notifications')
+
+    class Meta:
+        indexes = [
+            # Serves unread counts and "since" deltas for one user
+            models.Index(fields=['user', 'read', 'created_at'], name='notification_user_read_idx'),
+            # Newest-first listings for one user, read and unread alike
+            models.Index(fields=['user', 'created_at'], name='notification_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'Notification for {self.user.username}: {self.message[:30]}'
+
+class NotificationOutbox(models.Model):
+    """
+    One pending fan-out to every provider of `service`. Rows are written by the
+    request and expanded into Notification rows by api.outbox.
+    """
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='notification_events')
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Outbox event for {self.service_id}: {self.message[:30]}'
+
+
+class StatCounter(models.Model):
+    """
+    Running totals for the dashboard, kept current by signals (api.counters)
+    and rebuilt by `manage.py reconcile_counters`.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.key} = {self.value}'
+
+
+class SlotChange(models.Model):
+    """
+    One row per booking write that moved a slot, appended by api.occupancy.
+    Every process polls the rows after the last id it has seen and drops
+    its cached occupancy for those (service, date) pairs. A plain id rather
+    than a foreign key, so the booking signals sent while a service is
+    cascade-deleted can still record it. Old rows are pruned by the pollers.
+    """
+    service_id = models.IntegerField()
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
-        return f'Notification for {self.user.username}: {self.message[:30]}'
\ No newline at end of file
+        return f'{self.service_id} {self.date} #{self.id}'
@@ -0,0 +1,16 @@
+"""
+MongoDB (djongo) specifics, kept in one place so the views run unchanged on
+the relational DATABASE_PROFILEs. Nothing here imports bson: Mongo values
+are recognised by their interface.
+"""
+from django.db import connection
+
+
+def is_mongo():
+    return connection.vendor == 'djongo'
+
+
+def to_decimal(value):
+    """A DecimalField value as a Decimal; djongo hands back bson Decimal128."""
+    convert = getattr(value, 'to_decimal', None)
+    return convert() if convert is not None else value
@@ -0,0 +1,216 @@
+"""
+Per-process slot occupancy, answered from memory.
+
+Booking writes append a SlotChange row for the (service, date) they move.
+Each process reads the rows it has not seen yet at most once every
+POLL_INTERVAL seconds, from inside a lookup, and drops the entries they
+name, so a booking made by another process shows up within about
+POLL_INTERVAL. Entries older than MAX_AGE are re-read regardless, which
+bounds staleness if a change row was missed (ids committed out of order).
+The process that made a write updates its own entry in place.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Booking, SlotChange
+from .repository import booked_slots
+
+SLOT_BITS = {slot: 1 << i for i, (slot, _) in enumerate(Booking.SERVICE_TIMES)}
+
+OCCUPANCY_SETTINGS = {
+    'POLL_INTERVAL': 2,
+    'MAX_AGE': 300,
+    # More unseen changes than this (bulk imports) drop the whole index
+    'POLL_BATCH': 1000,
+    'RETENTION': 86400,
+}
+PRUNE_INTERVAL = 600
+# Local write markers kept before the oldest are forgotten
+MAX_TOUCHED = 10000
+
+
+def occupancy_setting(name):
+    return getattr(settings, 'OCCUPANCY_INDEX', {}).get(name, OCCUPANCY_SETTINGS[name])
+
+
+def slot_key(service_id, date):
+    day = date if isinstance(date, str) else date.isoformat()
+    return int(service_id), day
+
+
+def mask_to_slots(mask):
+    return [slot for slot, bit in SLOT_BITS.items() if mask & bit]
+
+
+def record_change(service_id, date):
+    """Append the SlotChange for one booking write and return its id."""
+    service_id, day = slot_key(service_id, date)
+    return SlotChange.objects.create(service_id=service_id, date=parse_date(day)).id
+
+
+def record_changes(keys):
+    """
+    record_change() for many (service_id, date) keys, for bulk writes that skip
+    the booking signals. Returns the ids the backend reported, which may be none.
+    """
+    days = {slot_key(service_id, date) for service_id, date in keys}
+    rows = SlotChange.objects.bulk_create(
+        [SlotChange(service_id=service_id, date=parse_date(day)) for service_id, day in days], batch_size=1000
+    )
+    return [row.id for row in rows if row.id is not None]
+
+
+class SlotOccupancyIndex:
+    """
+    Per-process map of (service_id, date) -> bitmask over Booking.SERVICE_TIMES.
+
+    A load only stores its mask if the key was not written or invalidated in
+    this process while the bookings were being read; each such event bumps
+    a local sequence number.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._touched = {}
+        self._sequence = 0
+        self._floor = 0
+        self._own_changes = set()
+        self._cursor = None
+        self._polled_at = None
+        self._pruned_at = None
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def get_mask(self, service_id, date):
+        self.poll()
+        key = slot_key(service_id, date)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < occupancy_setting('MAX_AGE'):
+            return entry[0]
+        return self.load(*key)
+
+    def sequence(self):
+        """Pass to store() for a mask read from the database after this call."""
+        with self._lock:
+            return self._sequence
+
+    def load(self, service_id, date):
+        sequence = self.sequence()
+        mask = 0
+        for slot in booked_slots(service_id, date):
+            mask |= SLOT_BITS.get(slot, 0)
+        self.store(service_id, date, mask, sequence)
+        return mask
+
+    def store(self, service_id, date, mask, sequence):
+        key = slot_key(service_id, date)
+        with self._lock:
+            if sequence < self._floor or self._touched.get(key, -1) > sequence:
+                return  # written meanwhile; this read may predate the write
+            self._entries[key] = (mask, time.monotonic())
+
+    def occupy(self, service_id, date, time_slot):
+        self._update(service_id, date, SLOT_BITS.get(time_slot, 0), True)
+
+    def release(self, service_id, date, time_slot):
+        self._update(service_id, date, SLOT_BITS.get(time_slot, 0), False)
+
+    def occupy_many(self, keys):
+        """Record bookings inserted with bulk_create, as (service_id, date, time_slot) keys."""
+        keys = [(*slot_key(service_id, date), time_slot) for service_id, date, time_slot in keys]
+        changes = record_changes((service_id, day) for service_id, day, _ in keys)
+        with self._lock:
+            # Without the new ids the next poll drops these entries again
+            self._own_changes.update(changes)
+            for service_id, day, time_slot in keys:
+                self._apply((service_id, day), SLOT_BITS.get(time_slot, 0), True)
+
+    def invalidate(self, service_id, date):
+        with self._lock:
+            self._drop(slot_key(service_id, date))
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def poll(self):
+        """Drop the entries other processes wrote to since the last poll, at most every POLL_INTERVAL."""
+        now = time.monotonic()
+        if self._polled_at is not None and now - self._polled_at < occupancy_setting('POLL_INTERVAL'):
+            return
+        if not self._poll_lock.acquire(blocking=False):
+            return  # another thread is polling
+        try:
+            self._polled_at = now
+            if self._cursor is None:
+                # Nothing is cached before the first poll; start from the latest change
+                cursor = SlotChange.objects.aggregate(last=Max('id'))['last'] or 0
+                with self._lock:
+                    self._own_changes = {change for change in self._own_changes if change > cursor}
+                    self._cursor = cursor
+                return
+            batch = occupancy_setting('POLL_BATCH')
+            rows = list(SlotChange.objects.filter(id__gt=self._cursor).order_by('id').values_list(
+                'id', 'service_id', 'date'
+            )[:batch])
+            if len(rows) >= batch:
+                cursor = SlotChange.objects.aggregate(last=Max('id'))['last'] or 0
+                with self._lock:
+                    self._clear()
+                    self._own_changes = {change for change in self._own_changes if change > cursor}
+                    self._cursor = cursor
+            elif rows:
+                with self._lock:
+                    for change, service_id, day in rows:
+                        if change in self._own_changes:
+                            self._own_changes.discard(change)
+                        else:
+                            self._drop(slot_key(service_id, day))
+                    self._cursor = rows[-1][0]
+            if self._pruned_at is None or now - self._pruned_at >= PRUNE_INTERVAL:
+                self._pruned_at = now
+                cutoff = timezone.now() - timedelta(seconds=occupancy_setting('RETENTION'))
+                SlotChange.objects.filter(created_at__lt=cutoff).delete()
+        finally:
+            self._poll_lock.release()
+
+    def _update(self, service_id, date, bit, occupied):
+        key = slot_key(service_id, date)
+        change = record_change(*key)
+        with self._lock:
+            self._own_changes.add(change)
+            self._apply(key, bit, occupied)
+
+    def _apply(self, key, bit, occupied):
+        self._touch(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            mask = entry[0] | bit if occupied else entry[0] & ~bit
+            self._entries[key] = (mask, entry[1])
+
+    def _touch(self, key):
+        if len(self._touched) >= MAX_TOUCHED:
+            self._touched.clear()
+            self._floor = self._sequence + 1
+        self._sequence += 1
+        self._touched[key] = self._sequence
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._touch(key)
+
+    def _clear(self):
+        self._entries.clear()
+        self._touched.clear()
+        self._sequence += 1
+        self._floor = self._sequence
+
+
+occupancy_index = SlotOccupancyIndex()
@@ -0,0 +1,149 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import Notification, NotificationOutbox, ServiceProviderService
+from .streams import notification_hub
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_SETTINGS = {
+    'INLINE_WORKER': True,
+    'BATCH_SIZE': 500,
+    'POLL_INTERVAL': 5,
+    'CLAIM_TIMEOUT': 300,
+}
+
+
+def outbox_setting(name):
+    return getattr(settings, 'NOTIFICATION_OUTBOX', {}).get(name, OUTBOX_SETTINGS[name])
+
+
+def notify_service_providers(service, message):
+    """
+    Record a single outbox event for `service`; the dispatcher creates one
+    Notification per provider later, outside the request.
+    """
+    event = NotificationOutbox.objects.create(service=service, message=message)
+    if outbox_setting('INLINE_WORKER'):
+        transaction.on_commit(get_dispatcher().wake)
+    return event
+
+
+def claim_pending(limit=100):
+    """
+    Claim up to `limit` undispatched events. Events claimed by a dispatcher
+    that died before finishing become claimable again after CLAIM_TIMEOUT.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=outbox_setting('CLAIM_TIMEOUT'))
+    candidates = list(
+        NotificationOutbox.objects.filter(dispatched_at__isnull=True)
+        .order_by('id')
+        .values_list('id', 'claimed_at')[:limit]
+    )
+    claimed = []
+    for event_id, claimed_at in candidates:
+        if claimed_at is not None and claimed_at > stale:
+            continue
+        # Conditional update so two dispatchers never expand the same event.
+        won = NotificationOutbox.objects.filter(
+            id=event_id, dispatched_at__isnull=True, claimed_at=claimed_at
+        ).update(claimed_at=now)
+        if won:
+            claimed.append(event_id)
+    return claimed
+
+
+def create_notifications(batch):
+    # bulk_create skips post_save, so wake the notification streams directly.
+    Notification.objects.bulk_create(batch)
+    user_ids = [n.user_id for n in batch]
+    transaction.on_commit(lambda: notification_hub.publish(user_ids))
+    return len(batch)
+
+
+def dispatch_event(event, batch_size=None):
+    """
+    Create the event's notifications and mark it dispatched in one
+    transaction. Where that is not atomic (MongoDB), a dispatcher that died
+    in between leaves the event to be claimed again; the retry skips the
+    providers that already have a notification for it, so each provider
+    gets the event once.
+    """
+    batch_size = batch_size or outbox_setting('BATCH_SIZE')
+    recipients = ServiceProviderService.objects.filter(service_id=event.service_id).values_list(
+        'serviceprovider__user_id', flat=True
+    )
+    batch = []
+    sent = 0
+    with transaction.atomic():
+        reached = set(Notification.objects.filter(event_id=event.id).values_list('user_id', flat=True))
+        for user_id in recipients.iterator():
+            if user_id in reached:
+                continue
+            reached.add(user_id)
+            batch.append(Notification(user_id=user_id, message=event.message, event_id=event.id))
+            if len(batch) >= batch_size:
+                sent += create_notifications(batch)
+                batch = []
+        if batch:
+            sent += create_notifications(batch)
+        NotificationOutbox.objects.filter(id=event.id).update(dispatched_at=timezone.now())
+    return sent
+
+
+def dispatch_pending(limit=100, batch_size=None):
+    """
+    Expand every claimable outbox event into provider notifications.
+    Returns (events dispatched, notifications created).
+    """
+    events = sent = 0
+    for event in NotificationOutbox.objects.filter(id__in=claim_pending(limit)).order_by('id'):
+        sent += dispatch_event(event, batch_size)
+        events += 1
+    return events, sent
+
+
+class OutboxDispatcher(threading.Thread):
+    """
+    Daemon thread that drains the outbox whenever a request records an event,
+    and every POLL_INTERVAL seconds to pick up events left by other processes.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name='notification-outbox', daemon=True)
+        self.interval = interval
+        self._wakeup = threading.Event()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                while dispatch_pending()[0]:
+                    pass
+            except Exception:
+                logger.exception('Notification outbox dispatch failed')
+            finally:
+                close_old_connections()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = OutboxDispatcher(outbox_setting('POLL_INTERVAL'))
+            _dispatcher.start()
+        return _dispatcher
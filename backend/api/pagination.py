@@ -0,0 +1,109 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_CHUNK_SIZE = 500
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), cls=JSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, fields):
+    """
+    Values of a cursor made by encode_cursor(), converted to the types of the
+    model `fields` it was made from; None if the cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    try:
+        values = [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, TypeError, ValueError):
+        return None
+    if None in values:
+        return None
+    return values
+
+
+def keyset_filter(keys, values):
+    """
+    Build the "strictly after" condition for a descending keyset ordering,
+    e.g. for ('date', 'id'): date < d OR (date = d AND id < i).
+    """
+    condition = Q()
+    for i, key in enumerate(keys):
+        step = Q(**{f'{key}__lt': values[i]})
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            step &= Q(**{prev_key: prev_value})
+        condition |= step
+    return condition
+
+
+def paginate_keyset(request, queryset, keys, rows):
+    """
+    Return one page of `queryset` ordered by `keys` (newest first), rendered
+    with the RowSerializer `rows`, plus an opaque `next_cursor`. Each page is
+    a single indexed range read, so the cost does not depend on how deep into
+    the history the client is. Every key must be one of the output fields.
+    """
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=400)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    queryset = queryset.order_by(*[f'-{key}' for key in keys])
+    cursor = request.GET.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor, [queryset.model._meta.get_field(key) for key in keys])
+        if values is None:
+            return Response({'error': 'Invalid cursor'}, status=400)
+        queryset = queryset.filter(keyset_filter(keys, values))
+
+    results = rows.serialize(queryset[:limit + 1])
+    has_more = len(results) > limit
+    results = results[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = results[-1]
+        next_cursor = encode_cursor(last[key] for key in keys)
+
+    return Response({
+        'results': results,
+        'next_cursor': next_cursor,
+    })
+
+
+def stream_json(queryset, rows, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream `queryset` as a JSON array, reading it `chunk_size` rows at a time
+    from a server-side iterator so memory stays flat for any collection size.
+    """
+    def generate():
+        yield '['
+        chunk = []
+        first = True
+        for item in rows.iterate(queryset, chunk_size):
+            chunk.append(json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')))
+            if len(chunk) >= chunk_size:
+                yield ('' if first else ',') + ','.join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield ('' if first else ',') + ','.join(chunk)
+        yield ']'
+
+    return StreamingHttpResponse(generate(), content_type='application/json')
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+
+def expand_recurrence(start, freq='weekly', interval=1, count=None, until=None, weekdays=None, limit=None):
+    """
+    Return the dates of an RRULE-style pattern starting at `start`: every
+    `interval` days ('daily') or weeks ('weekly', on the `weekdays` codes,
+    defaulting to the start's weekday), stopping after `count` dates or after
+    `until`, whichever comes first. At most `limit` dates are returned.
+    """
+    caps = [cap for cap in (count, limit) if cap is not None]
+    if not caps and until is None:
+        raise ValueError('A recurrence needs a count or an end date')
+    cap = min(caps) if caps else None
+
+    if freq == 'daily':
+        period, step, offsets = start, timedelta(days=interval), [0]
+    else:
+        period = start - timedelta(days=start.weekday())
+        step = timedelta(weeks=interval)
+        offsets = sorted({WEEKDAY_CODES.index(code) for code in weekdays}) if weekdays else [start.weekday()]
+
+    dates = []
+    while True:
+        for offset in offsets:
+            day = period + timedelta(days=offset)
+            if day < start:
+                continue
+            if (until is not None and day > until) or (cap is not None and len(dates) >= cap):
+                return dates
+            dates.append(day)
+        period += step
@@ -0,0 +1,177 @@
+"""
+The hottest read queries (availability, my bookings, notifications), each
+with an ORM implementation and a native pymongo one. djongo parses and
+translates SQL text on every ORM call; with MONGO_FAST_PATH on a djongo
+database these reads go straight to the collections as find / aggregate /
+count calls with projections instead.
+
+Both paths must return identical results; `manage.py check_fast_path` runs
+them side by side.
+"""
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .fast_serializers import booking_rows, notification_rows
+from .middleware import current_stats
+from .models import Booking, Notification
+from .mongo import is_mongo
+
+
+def fast_path_enabled():
+    return getattr(settings, 'MONGO_FAST_PATH', False) and is_mongo()
+
+
+def _use_fast_path(fast):
+    return fast_path_enabled() if fast is None else fast
+
+
+def _collection(model):
+    connection.ensure_connection()
+    return connection.connection[model._meta.db_table]
+
+
+def _run(call):
+    """Run one pymongo round trip, counted in the request's query stats like an ORM query."""
+    stats = current_stats.get()
+    start = time.perf_counter()
+    try:
+        return call()
+    finally:
+        if stats is not None:
+            stats.count += 1
+            stats.duration += time.perf_counter() - start
+
+
+def _converter(field):
+    """The djongo read-side conversion the ORM applies to `field`, if any."""
+    internal_type = field.get_internal_type()
+    if internal_type == 'DateField':
+        return lambda value: connection.ops.convert_datefield_value(value, None, connection)
+    if internal_type == 'DateTimeField':
+        return lambda value: connection.ops.convert_datetimefield_value(value, None, connection)
+    return None
+
+
+def _plan(model, lookups):
+    """
+    Resolve RowSerializer lookups against `model`: a list of (lookup, relation
+    field or None, column, converter). Only single-level relations are needed.
+    """
+    plan = []
+    for lookup in lookups:
+        if '__' in lookup:
+            relation_name, name = lookup.split('__')
+            relation = model._meta.get_field(relation_name)
+            field = relation.related_model._meta.get_field(name)
+        else:
+            relation, field = None, next(f for f in model._meta.concrete_fields if lookup in (f.name, f.attname))
+        plan.append((lookup, relation, field.column, _converter(field)))
+    return plan
+
+
+def _aggregate_rows(model, serializer, match, order=(), limit=None):
+    """
+    serializer.to_dict() for every document of `model` matching `match`, in
+    one aggregate: $match, $sort, $limit, then a $lookup per related model and
+    a projection down to the serializer's columns. Like the ORM's inner
+    joins, rows whose related document is missing are dropped.
+    """
+    plan = _plan(model, serializer.lookups)
+    pipeline = [{'$match': match}]
+    if order:
+        pipeline.append({'$sort': {
+            model._meta.get_field(name.lstrip('-')).column: -1 if name.startswith('-') else 1 for name in order
+        }})
+    if limit:
+        pipeline.append({'$limit': limit})
+    relations = list({relation.name: relation for _, relation, _, _ in plan if relation}.values())
+    for relation in relations:
+        pipeline.append({'$lookup': {
+            'from': relation.related_model._meta.db_table,
+            'localField': relation.column,
+            'foreignField': relation.target_field.column,
+            'as': relation.name,
+        }})
+    projection = {'_id': 0}
+    for _, relation, column, _ in plan:
+        projection[f'{relation.name}.{column}' if relation else column] = 1
+    pipeline.append({'$project': projection})
+
+    documents = _run(lambda: list(_collection(model).aggregate(pipeline)))
+    rows = []
+    for document in documents:
+        if any(not document.get(relation.name) for relation in relations):
+            continue
+        row = {}
+        for lookup, relation, column, convert in plan:
+            value = (document[relation.name][0] if relation else document).get(column)
+            row[lookup] = value if convert is None or value is None else convert(value)
+        rows.append(serializer.to_dict(row))
+    return rows
+
+
+def booked_slots(service_id, day, fast=None):
+    """time_slot of every booking of one service on one day."""
+    if not _use_fast_path(fast):
+        return list(Booking.objects.filter(service_id=service_id, date=day).values_list('time_slot', flat=True))
+    match = {'service_id': service_id, 'date': connection.ops.adapt_datefield_value(day)}
+    documents = _run(lambda: list(_collection(Booking).find(match, {'_id': 0, 'time_slot': 1})))
+    return [document['time_slot'] for document in documents]
+
+
+def booked_slot_rows(service_ids, start, end, fast=None):
+    """(service_id, date, time_slot) of every booking of `service_ids` from start to end, inclusive."""
+    if not _use_fast_path(fast):
+        return list(Booking.objects.filter(
+            service_id__in=service_ids, date__gte=start, date__lte=end
+        ).values_list('service_id', 'date', 'time_slot'))
+    match = {
+        'service_id': {'$in': list(service_ids)},
+        'date': {'$gte': connection.ops.adapt_datefield_value(start),
+                 '$lte': connection.ops.adapt_datefield_value(end)},
+    }
+    projection = {'_id': 0, 'service_id': 1, 'date': 1, 'time_slot': 1}
+    documents = _run(lambda: list(_collection(Booking).find(match, projection)))
+    convert = _converter(Booking._meta.get_field('date'))
+    return [(document['service_id'], convert(document['date']), document['time_slot']) for document in documents]
+
+
+def user_bookings(user_id, fast=None):
+    """booking_rows for every booking of one user."""
+    if not _use_fast_path(fast):
+        return booking_rows.serialize(Booking.objects.filter(user_id=user_id))
+    return _aggregate_rows(Booking, booking_rows, {'user_id': user_id})
+
+
+def user_notifications(user_id, since_id=None, since=None, order=(), limit=None, fast=None):
+    """
+    notification_rows for one user, optionally only those after id `since_id`
+    or created after `since`, ordered by the `order` field names, at most
+    `limit` of them.
+    """
+    if not _use_fast_path(fast):
+        notifications = Notification.objects.filter(user_id=user_id)
+        if since_id is not None:
+            notifications = notifications.filter(id__gt=since_id)
+        if since is not None:
+            notifications = notifications.filter(created_at__gt=since)
+        if order:
+            notifications = notifications.order_by(*order)
+        if limit:
+            notifications = notifications[:limit]
+        return notification_rows.serialize(notifications)
+
+    match = {'user_id': user_id}
+    if since_id is not None:
+        match['id'] = {'$gt': since_id}
+    if since is not None:
+        match['created_at'] = {'$gt': connection.ops.adapt_datetimefield_value(since)}
+    return _aggregate_rows(Notification, notification_rows, match, order, limit)
+
+
+def unread_notification_count(user_id, fast=None):
+    if not _use_fast_path(fast):
+        return Notification.objects.filter(user_id=user_id, read=False).count()
+    return _run(lambda: _collection(Notification).count_documents({'user_id': user_id, 'read': False}))
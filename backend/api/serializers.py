@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from .models import *
+from .recurrence import WEEKDAY_CODES, expand_recurrence
+
+# Largest number of bookings one batch request may create
+MAX_BATCH_BOOKINGS = 100
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -10,7 +14,6 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ('email', 'password', 'username', 'room_number')
 
     def create(self, validated_data):
-        print(validated_data)
         user = User.objects.create_user(
             email=validated_data['email'],
             username=validated_data['username'],  # required by AbstractUser
@@ -99,6 +102,69 @@ class BookingRateSerializer(serializers.Serializer):
     comment = serializers.CharField(required=False)
 
 
+class BookingBatchItemSerializer(serializers.Serializer):
+    # Plain ids: services are checked in one query by the view, not per item
+    service_id = serializers.IntegerField(required=False)
+    date = serializers.DateField()
+    time_slot = serializers.ChoiceField(choices=Booking.SERVICE_TIMES, required=False)
+
+
+class RecurrenceSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    freq = serializers.ChoiceField(choices=['daily', 'weekly'], default='weekly')
+    interval = serializers.IntegerField(min_value=1, default=1)
+    count = serializers.IntegerField(min_value=1, required=False)
+    until = serializers.DateField(required=False)
+    weekdays = serializers.ListField(child=serializers.ChoiceField(choices=WEEKDAY_CODES), required=False)
+
+    def validate(self, attrs):
+        if 'count' not in attrs and 'until' not in attrs:
+            raise serializers.ValidationError('Give a count or an until date.')
+        return attrs
+
+
+class BookingBatchSerializer(serializers.Serializer):
+    """
+    Either an explicit `items` list or a `recurrence` pattern; per-item
+    service_id / time_slot fall back to the top-level ones. Expands to
+    validated_data['bookings'], a list of {service_id, date, time_slot}.
+    """
+    service_id = serializers.IntegerField(required=False)
+    time_slot = serializers.ChoiceField(choices=Booking.SERVICE_TIMES, required=False)
+    special_instructions = serializers.CharField(required=False, allow_blank=True, default='')
+    items = BookingBatchItemSerializer(many=True, required=False)
+    recurrence = RecurrenceSerializer(required=False)
+    all_or_nothing = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if ('items' in attrs) == ('recurrence' in attrs):
+            raise serializers.ValidationError('Send either items or recurrence.')
+
+        if 'recurrence' in attrs:
+            rule = attrs['recurrence']
+            dates = expand_recurrence(limit=MAX_BATCH_BOOKINGS + 1, **rule)
+            items = [{'date': day} for day in dates]
+        else:
+            items = attrs['items']
+        if not items:
+            raise serializers.ValidationError('The batch is empty.')
+        if len(items) > MAX_BATCH_BOOKINGS:
+            raise serializers.ValidationError(f'At most {MAX_BATCH_BOOKINGS} bookings per batch.')
+
+        bookings = []
+        for item in items:
+            booking = {
+                'service_id': item.get('service_id', attrs.get('service_id')),
+                'date': item['date'],
+                'time_slot': item.get('time_slot', attrs.get('time_slot')),
+            }
+            if booking['service_id'] is None or booking['time_slot'] is None:
+                raise serializers.ValidationError('Every booking needs a service_id and a time_slot.')
+            bookings.append(booking)
+        attrs['bookings'] = bookings
+        return attrs
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -0,0 +1,125 @@
+import re
+import threading
+import time
+
+from .models import Service
+
+# Ids the admin UI uses when creating a service provider
+PREDEFINED_SERVICES = {
+    1: 'Laundry',
+    2: 'Room Cleaning',
+    3: 'Study Spaces',
+    4: 'Room Repairs',
+    5: 'Tech Support',
+    6: 'AI Booking Assistant',
+}
+
+# Other ways users and the assistant spell a service, already normalized
+ALIASES = {
+    'laundry service': 'Laundry',
+    'cleaning': 'Room Cleaning',
+    'room clean': 'Room Cleaning',
+    'study space': 'Study Spaces',
+    'study room': 'Study Spaces',
+    'room repair': 'Room Repairs',
+    'repairs': 'Room Repairs',
+    'repair': 'Room Repairs',
+    'tech': 'Tech Support',
+    'it support': 'Tech Support',
+    'booking assistant': 'AI Booking Assistant',
+}
+
+# Entries older than this are re-read, which bounds how stale the map can get
+# when another worker process wrote the Service table.
+SERVICE_NAMES_TTL = 60
+
+SEPARATORS = re.compile(r'[\s_\-]+')
+
+
+def normalize_name(name):
+    return SEPARATORS.sub(' ', str(name)).strip().casefold()
+
+
+PREDEFINED_BY_KEY = {normalize_name(name): name for name in PREDEFINED_SERVICES.values()}
+
+
+def predefined_name(value):
+    """
+    Name of the predefined service given by id or by (possibly aliased)
+    name, without touching the database; None if it is not predefined.
+    """
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return PREDEFINED_SERVICES.get(int(value))
+    key = normalize_name(value)
+    return ALIASES.get(key) or PREDEFINED_BY_KEY.get(key)
+
+
+class ServiceNameIndex:
+    """
+    Per-process map of normalized service name (and alias) -> (id, name,
+    availability), loaded with one query. Service signals apply this
+    process's writes in place; the map is reloaded after SERVICE_NAMES_TTL.
+    """
+
+    def __init__(self, ttl=SERVICE_NAMES_TTL):
+        self.ttl = ttl
+        self._entries = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def entries(self):
+        with self._lock:
+            entries, loaded_at = self._entries, self._loaded_at
+        if entries is not None and time.monotonic() - loaded_at < self.ttl:
+            return entries
+        return self.load()
+
+    def load(self):
+        entries = {}
+        for row in Service.objects.values_list('id', 'name', 'availability'):
+            self._add(entries, row)
+        with self._lock:
+            self._entries, self._loaded_at = entries, time.monotonic()
+        return entries
+
+    def update(self, service):
+        """Apply a saved Service to the loaded map (renames included)."""
+        self._replace(service.id, (service.id, service.name, service.availability))
+
+    def remove(self, service_id):
+        self._replace(service_id, None)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+
+    def _replace(self, service_id, row):
+        # Copy-on-write so readers never see a half-updated map; unknown
+        # state is loaded lazily.
+        with self._lock:
+            if self._entries is None:
+                return
+            entries = {key: entry for key, entry in self._entries.items() if entry[0] != service_id}
+            if row is not None:
+                self._add(entries, row)
+            self._entries = entries
+
+    @staticmethod
+    def _add(entries, row):
+        key = normalize_name(row[1])
+        entries[key] = row
+        for alias, name in ALIASES.items():
+            if normalize_name(name) == key:
+                entries.setdefault(alias, row)
+
+    def resolve(self, name):
+        """Id of the service called (or aliased) `name`, or None."""
+        entry = self.entries().get(normalize_name(name))
+        return entry[0] if entry else None
+
+    def names(self, available_only=True):
+        return sorted({name for _, name, availability in self.entries().values()
+                       if availability or not available_only})
+
+
+service_names = ServiceNameIndex()
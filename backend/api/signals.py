@@ -0,0 +1,93 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import counters
+from .authentication import forget_claims, remember_claims
+from .catalog import invalidate_catalog
+from .models import Booking, Notification, Service, User
+from .occupancy import occupancy_index
+from .service_names import service_names
+from .streams import notification_hub
+
+
+def _slot_of(booking):
+    return booking.service_id, booking.date, booking.time_slot
+
+
+@receiver(post_init, sender=Booking)
+def remember_booking_slot(sender, instance, **kwargs):
+    # Keep the slot the row was loaded with so reschedules can release it.
+    instance._occupancy_slot = _slot_of(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_occupancy_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_occupancy_slot', None)
+    if not created and previous == _slot_of(instance):
+        return  # status, rating, ...: the slot did not move
+    if not created and previous and previous[0] is not None and previous[1] is not None:
+        occupancy_index.release(*previous)
+    occupancy_index.occupy(*_slot_of(instance))
+    instance._occupancy_slot = _slot_of(instance)
+
+
+@receiver(post_delete, sender=Booking)
+def update_occupancy_on_delete(sender, instance, **kwargs):
+    occupancy_index.release(*_slot_of(instance))
+
+
+@receiver(post_save, sender=Notification)
+def publish_notification(sender, instance, created, **kwargs):
+    if created:
+        notification_hub.publish([instance.user_id])
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_service_catalog(sender, **kwargs):
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=Service)
+def index_service_name(sender, instance, **kwargs):
+    service_names.update(instance)
+
+
+@receiver(post_delete, sender=Service)
+def unindex_service_name(sender, instance, **kwargs):
+    service_names.remove(instance.id)
+
+
+@receiver(post_save, sender=Booking)
+def count_new_booking(sender, instance, created, **kwargs):
+    if created:
+        counters.increment(counters.TOTAL_BOOKINGS)
+        counters.increment(counters.user_bookings_key(instance.user_id))
+
+
+@receiver(post_delete, sender=Booking)
+def count_deleted_booking(sender, instance, **kwargs):
+    counters.increment(counters.TOTAL_BOOKINGS, -1)
+    counters.increment(counters.user_bookings_key(instance.user_id), -1)
+
+
+@receiver(post_save, sender=Service)
+def count_new_service(sender, instance, created, **kwargs):
+    if created:
+        counters.increment(counters.TOTAL_SERVICES)
+
+
+@receiver(post_delete, sender=Service)
+def count_deleted_service(sender, instance, **kwargs):
+    counters.increment(counters.TOTAL_SERVICES, -1)
+
+
+@receiver(post_save, sender=User)
+def refresh_user_claims(sender, instance, **kwargs):
+    # Tokens issued with older role/room claims fall back to a DB lookup.
+    remember_claims(instance)
+
+
+@receiver(post_delete, sender=User)
+def drop_user_claims(sender, instance, **kwargs):
+    forget_claims(instance.pk)
@@ -0,0 +1,206 @@
+"""
+Server-sent events stream of new notifications, served directly by the ASGI
+application (see backend/asgi.py) so idle connections never hold a worker.
+
+    GET /api/notifications/stream?token=<access token>
+
+Each event carries the notification id as its SSE id, so a reconnecting
+EventSource resumes from Last-Event-ID instead of replaying history.
+
+Streams only query the database when woken. Writes made in this process wake
+them directly (NotificationHub.publish from signals and the outbox). There is
+no shared broker between processes, so rows written by other workers are
+picked up by a polling fallback: one watcher per process reads the new
+notification ids every WATCH_INTERVAL seconds and wakes the affected users,
+instead of every connection polling on its own.
+"""
+import asyncio
+import json
+import threading
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from .authentication import ClaimsJWTAuthentication
+from .models import Notification
+from .fast_serializers import notification_rows
+
+STREAM_PATH = '/api/notifications/stream'
+
+# Idle connections get a keep-alive comment this often (no database query).
+KEEPALIVE_INTERVAL = 15
+# How often the per-process watcher looks for rows written by other processes.
+WATCH_INTERVAL = 2
+STREAM_BATCH_SIZE = 100
+
+
+class NotificationHub:
+    """
+    Wakes the stream connections of users that just received a notification.
+    publish() may be called from any thread (sync views, the outbox
+    dispatcher); waiters live on the ASGI event loop.
+    """
+
+    def __init__(self):
+        self._waiters = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def subscribe(self, user_id):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(user_id, set()).add(waiter)
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.ensure_future(self._watch())
+        return waiter
+
+    def unsubscribe(self, user_id, waiter):
+        with self._lock:
+            waiters = self._waiters.get(user_id)
+            if waiters:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[user_id]
+
+    def publish(self, user_ids):
+        with self._lock:
+            waiters = [w for uid in set(user_ids) for w in self._waiters.get(uid, ())]
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def _watch(self):
+        """Wake subscribers of rows other processes wrote; runs while anyone is connected."""
+        cursor = await sync_to_async(latest_notification_id)()
+        while self._waiters:
+            await asyncio.sleep(WATCH_INTERVAL)
+            rows = await sync_to_async(notification_users_after)(cursor)
+            if rows:
+                cursor = rows[-1][0]
+                self.publish([user_id for _, user_id in rows])
+
+
+notification_hub = NotificationHub()
+
+
+def authenticate_stream(raw_token):
+    auth = ClaimsJWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        # AuthenticationFailed: the user was deleted or deactivated
+        return None
+
+
+def latest_notification_id(user_id=None):
+    notifications = Notification.objects.all() if user_id is None else Notification.objects.filter(user_id=user_id)
+    last = notifications.order_by('-id').values_list('id', flat=True).first()
+    return last or 0
+
+
+def notification_users_after(cursor):
+    """(id, user_id) of notifications newer than `cursor`, oldest first."""
+    return list(Notification.objects.filter(id__gt=cursor).order_by('id').values_list('id', 'user_id')[:1000])
+
+
+def notifications_after(user_id, cursor):
+    notifications = Notification.objects.filter(user_id=user_id, id__gt=cursor).order_by('id')[:STREAM_BATCH_SIZE]
+    return notification_rows.serialize(notifications)
+
+
+def format_event(notification):
+    data = json.dumps(notification, cls=JSONEncoder, ensure_ascii=False)
+    return f"id: {notification['id']}\nevent: notification\ndata: {data}\n\n".encode()
+
+
+def get_header(scope, name):
+    for key, value in scope.get('headers', []):
+        if key.decode('latin1').lower() == name:
+            return value.decode('latin1')
+    return None
+
+
+async def notification_stream(scope, receive, send):
+    query = parse_qs(scope.get('query_string', b'').decode())
+    raw_token = query.get('token', [None])[0]
+    authorization = get_header(scope, 'authorization')
+    if not raw_token and authorization and authorization.startswith('Bearer '):
+        raw_token = authorization[len('Bearer '):]
+
+    user = await sync_to_async(authenticate_stream)(raw_token) if raw_token else None
+    if user is None:
+        await send({'type': 'http.response.start', 'status': 401,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"error": "Authentication required"}'})
+        return
+
+    # Resume point: EventSource sends Last-Event-ID on reconnect; ?after= lets
+    # other clients pass it explicitly. A fresh connection starts at "now".
+    cursor = get_header(scope, 'last-event-id') or query.get('after', [None])[0]
+    try:
+        cursor = int(cursor)
+    except (TypeError, ValueError):
+        cursor = await sync_to_async(latest_notification_id)(user.id)
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'access-control-allow-origin', b'*'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': b'retry: 3000\n\n', 'more_body': True})
+
+    waiter = notification_hub.subscribe(user.id)
+    wakeup = waiter[1]
+    disconnected = False
+
+    async def watch_disconnect():
+        nonlocal disconnected
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected = True
+                wakeup.set()
+                return
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        while not disconnected:
+            wakeup.clear()
+            batch = await sync_to_async(notifications_after)(user.id, cursor)
+            for notification in batch:
+                await send({'type': 'http.response.body', 'body': format_event(notification), 'more_body': True})
+                cursor = notification['id']
+            if len(batch) == STREAM_BATCH_SIZE:
+                continue
+
+            # Only query again once woken; an idle connection just gets keep-alives
+            while not wakeup.is_set():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    await send({'type': 'http.response.body', 'body': b': keep-alive\n\n', 'more_body': True})
+    except OSError:
+        pass
+    finally:
+        notification_hub.unsubscribe(user.id, waiter)
+        watcher.cancel()
+
+
+def route_streams(django_application, handlers):
+    """
+    Wrap the Django ASGI application so long-lived streaming endpoints in
+    `handlers` ({path: ASGI callable}) run directly on the event loop.
+    """
+    async def application(scope, receive, send):
+        handler = handlers.get(scope['path']) if scope['type'] == 'http' else None
+        if handler is not None:
+            await handler(scope, receive, send)
+        else:
+            await django_application(scope, receive, send)
+    return application
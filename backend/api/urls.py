@@ -7,8 +7,10 @@ urlpatterns = [
     path('auth/profile', ProfileView.as_view()),
     path('services', ServiceListView.as_view()),
     path('bookings', BookingCreateView.as_view()),
+    path('bookings/batch', BookingBatchCreateView.as_view()),
     path('bookings/my', MyBookingsView.as_view()),
     path('bookings/availability', get_unavailable_slots),
+    path('bookings/availability/matrix', get_availability_matrix),
     path('bookings/<int:booking_id>/cancel', CancelBookingView.as_view()),
     path('bookings/<int:booking_id>/reschedule', RescheduleBookingView.as_view()),
     path('bookings/<int:booking_id>/rate', RateBookingView.as_view()),
@@ -27,12 +29,16 @@ urlpatterns = [
     
     path('service-provider/profile', service_provider_profile),
     path('service-provider/bookings', get_assigned_bookings),
+    path('service-provider/calendar', get_provider_calendar),
     path('service-provider/bookings/<int:booking_id>/status', update_booking_status),
     path('service-provider/bookings/<int:booking_id>/notify-completion', send_completion_notification),
     path('service-provider/notifications', get_service_provider_notifications),
+    path('service-provider/notifications/read', mark_service_provider_notifications_read),
     path('service-provider/notifications/<int:notification_id>/read', mark_service_provider_notification_read),
     
     path('notifications/user', get_user_notifications),
+    path('notifications/unread-count', get_unread_notification_count),
+    path('notifications/read', mark_notifications_read),
     path('notifications/<int:notification_id>/read', mark_notification_read),
     path('notifications/booking/<int:booking_id>', send_booking_notification),
 ]
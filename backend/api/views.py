@@ -1,17 +1,30 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import tokens_for_user
 from .serializers import *
 from .models import *
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
-from bson import ObjectId
 from rest_framework.permissions import IsAdminUser
 from datetime import datetime, timedelta
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from .pagination import paginate_keyset, stream_json
+from .fast_serializers import booking_rows, calendar_rows, user_rows
+from .occupancy import occupancy_index, mask_to_slots, SLOT_BITS
+from .outbox import notify_service_providers
+from .catalog import get_catalog
+from .service_names import predefined_name
+from .repository import booked_slot_rows, unread_notification_count, user_bookings, user_notifications
+from . import counters
+from django.http import HttpResponse, HttpResponseNotModified
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = tokens_for_user(user)
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -19,17 +32,18 @@ def get_tokens_for_user(user):
 
 class RegisterView(APIView):
     def post(self, request):
-        print(request.data)
+        # Not the body: it carries the password
+        logger.debug('Registration request for %s', request.data.get('email'))
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = tokens_for_user(user)
             return Response({
                 'user': ProfileSerializer(user).data,
                 'access_token': str(refresh.access_token)
             }, status=201)
         else:
-            print(serializer.errors)
+            logger.warning('Registration rejected: %s', serializer.errors)
         return Response(serializer.errors, status=400)
 
 
@@ -38,15 +52,12 @@ class LoginView(APIView):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data
-            print(user)
             tokens = get_tokens_for_user(user)
             profile = ProfileSerializer(user)
-            print(profile.data)
             return Response({
                 'user': profile.data,
                 'access_token': tokens['access'],
             }, status=200)
-        print(serializer)
         return Response(serializer.errors, status=400)
 
 
@@ -61,15 +72,22 @@ class ProfileView(APIView):
 class ServiceListView(APIView):
     def get(self, request):
         try:
-            services = Service.objects.all()
-            services = [s for s in services if s.availability is True]
-            serializer = ServiceSerializer(services, many=True)
-            return Response(serializer.data)
+            body, etag = get_catalog()
         except Exception as e:
             return Response({'error': str(e)}, status=500)
 
+        # Weak comparison, as for GET (RFC 7232 3.2)
+        tags = parse_etags(request.headers.get('If-None-Match', ''))
+        if '*' in tags or etag in {tag[2:] if tag.startswith('W/') else tag for tag in tags}:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
+
 
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 class BookingCreateView(APIView):
     permission_classes = [IsAuthenticated]
@@ -78,50 +96,187 @@ class BookingCreateView(APIView):
         serializer = BookingSerializer(data=request.data)
         if serializer.is_valid():
             try:
-                print("request", request.data)
                 booking = serializer.save(user=request.user)
-                # Send notification to service providers
+                # Provider notifications are fanned out by the outbox dispatcher
                 service = booking.service
-                service_providers = service.provider_links.all()
-                for sp_link in service_providers:
-                    service_provider = sp_link.serviceprovider
-                    Notification.objects.create(
-                        user=service_provider.user,
-                        message=f'New booking for {service.name} on {booking.date} at {booking.time_slot}.'
-                    )
-
+                notify_service_providers(
+                    service,
+                    f'New booking for {service.name} on {booking.date} at {booking.time_slot}.'
+                )
 
                 return Response(serializer.data, status=201)
 
             except IntegrityError:
+                # Another worker took the slot; drop our possibly stale entry.
+                occupancy_index.invalidate(
+                    serializer.validated_data['service'].id, serializer.validated_data['date']
+                )
                 return Response(
                     {'error': 'This time slot is already booked for the selected service. Please choose another slot.'},
                     status=400
                 )
         else:
-            print(serializer.errors)
+            logger.warning('Booking rejected: %s', serializer.errors)
+            return Response(serializer.errors, status=400)
+
+
+
+class BookingBatchCreateView(APIView):
+    """
+    Create many bookings in one request, from an explicit list or a
+    recurrence pattern (e.g. laundry every Monday for a term). Everything is
+    checked up front against the (service, date, time_slot) constraint; the
+    free slots are inserted with a single bulk_create and the rest come back
+    in a per-item conflict report. With all_or_nothing nothing is created
+    when any item conflicts.
+
+    The insert is not atomic on MongoDB (djongo has no transactions): if a
+    slot is taken between the check and the insert, the rows inserted before
+    it stay. The view then re-reads which rows made it, inserts the rest one
+    by one, applies the side effects of everything created and reports each
+    lost slot as a conflict. With all_or_nothing the created rows are
+    deleted again.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BookingBatchSerializer(data=request.data)
+        if not serializer.is_valid():
             return Response(serializer.errors, status=400)
+        data = serializer.validated_data
+        requested = data['bookings']
+
+        services = Service.objects.in_bulk({item['service_id'] for item in requested})
+        unknown = sorted({item['service_id'] for item in requested} - set(services))
+        if unknown:
+            return Response({'error': f'Unknown service id(s): {unknown}'}, status=400)
+
+        taken = set(
+            Booking.objects.filter(
+                service_id__in=list(services), date__in={item['date'] for item in requested}
+            ).values_list('service_id', 'date', 'time_slot')
+        )
+        today = datetime.now().date()
+        conflicts, to_create, positions = [], [], {}
+        for index, item in enumerate(requested):
+            key = (item['service_id'], item['date'], item['time_slot'])
+            if item['date'] < today or item['time_slot'] in past_slots(item['date']):
+                reason = 'past'
+            elif key in taken:
+                reason = 'already_booked'
+            elif key in positions:
+                reason = 'duplicate'
+            else:
+                positions[key] = index
+                to_create.append(key)
+                continue
+            conflicts.append({
+                'index': index,
+                'service_id': key[0],
+                'date': key[1],
+                'time_slot': key[2],
+                'reason': reason,
+            })
+
+        if not to_create or (conflicts and data['all_or_nothing']):
+            return Response({'created': [], 'conflicts': conflicts}, status=409)
+
+        def new_booking(key):
+            return Booking(user=request.user, service_id=key[0], date=key[1], time_slot=key[2],
+                           special_instructions=data['special_instructions'])
+
+        try:
+            with transaction.atomic():
+                Booking.objects.bulk_create([new_booking(key) for key in to_create])
+            inserted = to_create
+        except IntegrityError:
+            # A slot was taken between the check and the insert. Relational
+            # backends roll the whole batch back; MongoDB has no transactions
+            # here, so the rows before the failing one stay inserted. Ask the
+            # database which of ours made it, then insert the rest one by one
+            # so each lost slot is reported on its own.
+            inserted = self.inserted_keys(request.user, to_create)
+            for key in [key for key in to_create if key not in inserted]:
+                try:
+                    with transaction.atomic():
+                        Booking.objects.bulk_create([new_booking(key)])
+                    inserted.append(key)
+                except IntegrityError:
+                    occupancy_index.invalidate(key[0], key[1])
+                    conflicts.append({
+                        'index': positions[key],
+                        'service_id': key[0],
+                        'date': key[1],
+                        'time_slot': key[2],
+                        'reason': 'already_booked',
+                    })
+            conflicts.sort(key=lambda conflict: conflict['index'])
+
+        undo = data['all_or_nothing'] and len(inserted) < len(to_create)
+        if inserted:
+            self.apply_side_effects(request.user, services, inserted, notify=not undo)
+        if inserted and undo:
+            # Remove the partial insert; the delete signals reverse the counters and occupancy.
+            Booking.objects.filter(id__in=[row['id'] for row in self.created_rows(request.user, inserted)]).delete()
+            inserted = []
+        if not inserted:
+            return Response(
+                {'error': 'Some of these slots were just booked by someone else. Please retry.',
+                 'created': [], 'conflicts': conflicts},
+                status=409
+            )
+        return Response({'created': self.created_rows(request.user, inserted), 'conflicts': conflicts}, status=201)
+
+    def inserted_keys(self, user, keys):
+        """The (service_id, date, time_slot) keys of `keys` that are now booked by `user`."""
+        rows = set(Booking.objects.filter(
+            user=user, service_id__in={key[0] for key in keys}, date__in={key[1] for key in keys}
+        ).values_list('service_id', 'date', 'time_slot'))
+        return [key for key in keys if key in rows]
+
+    def apply_side_effects(self, user, services, keys, notify=True):
+        """bulk_create sends no post_save signals, so apply their side effects here."""
+        occupancy_index.occupy_many(keys)
+        counters.increment(counters.TOTAL_BOOKINGS, len(keys))
+        counters.increment(counters.user_bookings_key(user.id), len(keys))
+        if not notify:
+            return
+
+        by_service = {}
+        for service_id, day, slot in keys:
+            by_service.setdefault(service_id, []).append((day, slot))
+        for service_id, slots in by_service.items():
+            service = services[service_id]
+            if len(slots) == 1:
+                message = f'New booking for {service.name} on {slots[0][0]} at {slots[0][1]}.'
+            else:
+                message = f'{len(slots)} new bookings for {service.name} from {min(slots)[0]} to {max(slots)[0]}.'
+            notify_service_providers(service, message)
 
+    def created_rows(self, user, keys):
+        created_keys = {(service_id, day.isoformat(), slot) for service_id, day, slot in keys}
+        created = Booking.objects.filter(
+            user=user, service_id__in={key[0] for key in keys}, date__in={key[1] for key in keys}
+        ).order_by('date', 'time_slot')
+        return [row for row in booking_rows.serialize(created)
+                if (row['service']['id'], row['date'], row['time_slot']) in created_keys]
 
 
 class MyBookingsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        bookings = Booking.objects.filter(user=request.user)
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        return Response(user_bookings(request.user.id))
 
 
 class CancelBookingView(APIView):
     permission_classes = [IsAuthenticated]
 
     def put(self, request, booking_id):
-        print(booking_id)
         try:
             booking = Booking.objects.get(id=booking_id, user=request.user)
         except Booking.DoesNotExist:
-            print("error")
+            logger.debug('Cancel of booking %s by user %s: not found', booking_id, request.user.id)
             return Response({'error': 'Booking not found'}, status=404)
 
         booking.status = 'Cancelled'
@@ -167,26 +322,20 @@ class RateBookingView(APIView):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_student_notifications(request):
-    notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
-    print(notifications)
-    serializer = NotificationSerializer(notifications, many=True)
-    return Response(serializer.data)
+    return Response(user_notifications(request.user.id, order=('-created_at',)))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
-    total_services = Service.objects.count()
-    total_bookings = Booking.objects.count()
-    user_bookings = Booking.objects.filter(user=request.user).count()
-
-    res= Response({
-        'total_services': total_services,
-        'total_bookings': total_bookings,
-        'your_bookings': user_bookings
+    user_key = counters.user_bookings_key(request.user.id)
+    counts = counters.get_counts([counters.TOTAL_SERVICES, counters.TOTAL_BOOKINGS, user_key])
+
+    return Response({
+        'total_services': counts[counters.TOTAL_SERVICES],
+        'total_bookings': counts[counters.TOTAL_BOOKINGS],
+        'your_bookings': counts[user_key]
     })
-    print(res.data)
-    return res
 
 def parse_date_string(date_str):
     """
@@ -205,42 +354,96 @@ def parse_date_string(date_str):
             return datetime.combine(dt.date(), datetime.min.time())
         except ValueError:
             return None
+
+
+def past_slots(day):
+    """
+    Return the slots on `day` that have already ended (only ever non-empty
+    for today).
+    """
+    if day != datetime.now().date():
+        return set()
+    current_time = datetime.now().time()
+    ended = set()
+    for slot, _ in Booking.SERVICE_TIMES:
+        _, end_time_str = slot.split('-')
+        end_time = datetime.strptime(end_time_str, '%H:%M').time()
+        if current_time > end_time:
+            ended.add(slot)
+    return ended
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_unavailable_slots(request):
     service_id = request.GET.get('service_id')
     date_str = request.GET.get('date')
-    print(date_str)
 
-    parsed_date = parse_date_string(date_str)
+    parsed_date = parse_date_string(date_str or '')
     if not parsed_date:
         return Response({'error': 'Invalid date format'}, status=400)
+    try:
+        service_id = int(service_id)
+    except (TypeError, ValueError):
+        return Response({'error': 'Invalid service id'}, status=400)
 
-    # Corrected: no __date since date is DateField
-    bookings = Booking.objects.filter(service_id=service_id, date=parsed_date.date())
-    print(bookings)
-    unavailable = set(bookings.values_list('time_slot', flat=True))
-
-    all_time_slots = [
-        '08:00-10:00',
-        '10:00-12:00',
-        '12:00-14:00',
-        '14:00-16:00',
-        '16:00-18:00',
-    ]
-
-    today_str = datetime.now().date().isoformat()
-    if parsed_date.date().isoformat() == today_str:
-        current_time = datetime.now().time()
-        for slot in all_time_slots:
-            _, end_time_str = slot.split('-')
-            end_time = datetime.strptime(end_time_str, '%H:%M').time()
-            if current_time > end_time:
-                unavailable.add(slot)
+    # Answered from the per-process occupancy index; the bookings are read only
+    # when the (service, date) entry is missing or another process changed it.
+    mask = occupancy_index.get_mask(service_id, parsed_date.date())
+    unavailable = set(mask_to_slots(mask))
+    unavailable |= past_slots(parsed_date.date())
 
     return Response({'unavailable_slots': list(unavailable)})
 
 
+MAX_MATRIX_DAYS = 31
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_availability_matrix(request):
+    """
+    Unavailable slots for several services over a date range in one query:
+    ?service_ids=1,2,3&start=2025-07-14&end=2025-07-20
+    """
+    raw_ids = ','.join(request.GET.getlist('service_ids'))
+    try:
+        service_ids = sorted({int(sid) for sid in raw_ids.split(',') if sid.strip()})
+    except ValueError:
+        return Response({'error': 'Invalid service id'}, status=400)
+    if not service_ids:
+        return Response({'error': 'service_ids is required'}, status=400)
+
+    start = parse_date_string(request.GET.get('start', 'today'))
+    end = parse_date_string(request.GET.get('end', '')) if request.GET.get('end') else start
+    if not start or not end or end < start:
+        return Response({'error': 'Invalid date range'}, status=400)
+    start, end = start.date(), end.date()
+    days = (end - start).days + 1
+    if days > MAX_MATRIX_DAYS:
+        return Response({'error': f'Date range is limited to {MAX_MATRIX_DAYS} days'}, status=400)
+    dates = [start + timedelta(days=i) for i in range(days)]
+
+    # Taken before the read, so masks a concurrent write made stale are not cached
+    sequence = occupancy_index.sequence()
+    masks = {(sid, day): 0 for sid in service_ids for day in dates}
+    for sid, day, slot in booked_slot_rows(service_ids, start, end):
+        masks[(sid, day)] |= SLOT_BITS.get(slot, 0)
+
+    matrix = {}
+    for (sid, day), mask in masks.items():
+        occupancy_index.store(sid, day, mask, sequence)
+        unavailable = set(mask_to_slots(mask)) | past_slots(day)
+        matrix.setdefault(str(sid), {})[day.isoformat()] = [
+            slot for slot, _ in Booking.SERVICE_TIMES if slot in unavailable
+        ]
+
+    return Response({
+        'time_slots': [slot for slot, _ in Booking.SERVICE_TIMES],
+        'unavailable_slots': matrix,
+    })
+
+
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def delete_booking(request, booking_id):
@@ -254,16 +457,23 @@ def delete_booking(request, booking_id):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_all_bookings(request):
-    bookings = Booking.objects.select_related('user', 'service').all()
-    serializer = BookingSerializer(bookings, many=True)
-    return Response(serializer.data)
+    bookings = Booking.objects.all()
+    # ?stream=1 streams the full list, ?limit=/?cursor= returns keyset pages
+    if request.GET.get('stream'):
+        return stream_json(bookings.order_by('-date', '-id'), booking_rows)
+    if 'cursor' in request.GET or 'limit' in request.GET:
+        return paginate_keyset(request, bookings, ('date', 'id'), booking_rows)
+    return Response(booking_rows.serialize(bookings))
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_all_users(request):
     users = get_user_model().objects.all()
-    serializer = UserSerializer(users, many=True)
-    return Response(serializer.data)
+    if request.GET.get('stream'):
+        return stream_json(users.order_by('-id'), user_rows)
+    if 'cursor' in request.GET or 'limit' in request.GET:
+        return paginate_keyset(request, users, ('id',), user_rows)
+    return Response(user_rows.serialize(users))
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
@@ -275,15 +485,6 @@ def get_service_providers(request):
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def create_service_provider(request):
-    predefined_services = {
-        1: 'Laundry',
-        2: 'Room Cleaning',
-        3: 'Study Spaces',
-        4: 'Room Repairs',
-        5: 'Tech Support',
-        6: 'AI Booking Assistant'
-    }
-
     name = request.data.get('name')
     email = request.data.get('email')
     phone = request.data.get('phone')
@@ -314,7 +515,8 @@ def create_service_provider(request):
     created_services = []
 
     for sid in service_ids:
-        service_name = predefined_services.get(sid)
+        # Predefined services may be given by id or by (aliased) name
+        service_name = predefined_name(sid)
         if service_name:
             service, created = Service.objects.get_or_create(
                 name=service_name,
@@ -395,7 +597,6 @@ def delete_service_provider(request, provider_id):
 def service_provider_profile(request):
     if not request.user.is_serviceprovider:
         return Response({'error': 'Not a service provider'}, status=403)
-    print("Request", request.data)
     profile = ServiceProvider.objects.filter(user=request.user).first()
     if not profile:
         return Response({'error': 'Service provider profile not found'}, status=404)
@@ -421,13 +622,55 @@ def get_assigned_bookings(request):
         service_provider = request.user.provider_profile 
         service_ids = service_provider.service_links.values_list('service_id', flat=True)
         bookings = Booking.objects.filter(service_id__in=service_ids)
+        return Response(booking_rows.serialize(bookings))
+
+    except AttributeError:
+        return Response({'error': 'No service provider profile found.'}, status=400)
 
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_provider_calendar(request):
+    """
+    The provider's bookings for one week as a date x time slot grid:
+    ?week=2025-07-16 (any day of the week, defaults to today). One range
+    query on (service, date), so the payload is sized to the week rather
+    than to the provider's whole history.
+    """
+    if not getattr(request.user, 'is_serviceprovider', False):
+        return Response({'error': 'Not a service provider'}, status=403)
+
+    day = parse_date_string(request.GET.get('week', 'today'))
+    if not day:
+        return Response({'error': 'Invalid week'}, status=400)
+    week_start = day.date() - timedelta(days=day.weekday())
+    week_end = week_start + timedelta(days=6)
+
+    try:
+        service_ids = request.user.provider_profile.service_links.values_list('service_id', flat=True)
     except AttributeError:
         return Response({'error': 'No service provider profile found.'}, status=400)
 
+    time_slots = [slot for slot, _ in Booking.SERVICE_TIMES]
+    grid = {
+        (week_start + timedelta(days=i)).isoformat(): {slot: [] for slot in time_slots}
+        for i in range(7)
+    }
+    bookings = Booking.objects.filter(
+        service_id__in=service_ids, date__gte=week_start, date__lte=week_end
+    ).order_by('date', 'time_slot', 'service_id')
+    for cell in calendar_rows.iterate(bookings):
+        slots = grid[cell['date']]
+        if cell['time_slot'] in slots:
+            slots[cell['time_slot']].append(cell)
+
+    return Response({
+        'week_start': week_start.isoformat(),
+        'week_end': week_end.isoformat(),
+        'time_slots': time_slots,
+        'days': [{'date': date, 'slots': slots} for date, slots in grid.items()],
+    })
+
 
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
@@ -440,7 +683,10 @@ def update_booking_status(request, booking_id):
         return Response({'error': 'Invalid status'}, status=400)
     
     try:
-        booking = Booking.objects.get(id=booking_id, service__in=request.user.serviceprovider.services.all())
+        service_ids = request.user.provider_profile.service_links.values_list('service_id', flat=True)
+        booking = Booking.objects.get(id=booking_id, service_id__in=service_ids)
+    except AttributeError:
+        return Response({'error': 'No service provider profile found.'}, status=400)
     except Booking.DoesNotExist:
         return Response({'error': 'Booking not found'}, status=404)
     
@@ -456,7 +702,10 @@ def send_completion_notification(request, booking_id):
     
     message = request.data.get('message', 'Service completed')
     try:
-        booking = Booking.objects.get(id=booking_id, service__in=request.user.serviceprovider.services.all())
+        service_ids = request.user.provider_profile.service_links.values_list('service_id', flat=True)
+        booking = Booking.objects.get(id=booking_id, service_id__in=service_ids)
+    except AttributeError:
+        return Response({'error': 'No service provider profile found.'}, status=400)
     except Booking.DoesNotExist:
         return Response({'error': 'Booking not found'}, status=404)
     
@@ -467,15 +716,51 @@ def send_completion_notification(request, booking_id):
     )
     return Response({'message': 'Notification sent'})
 
+MAX_NOTIFICATION_LIMIT = 200
+
+
+def notification_filters(request):
+    """
+    Parse the optional ?since=<id or ISO timestamp> and ?limit= params into
+    user_notifications() arguments. With `since` only newer rows are returned,
+    oldest first, so the client can keep the last id as its next cursor.
+    Returns (filters, error response).
+    """
+    filters = {}
+    since = request.GET.get('since')
+    if since:
+        if since.isdigit():
+            filters['since_id'] = int(since)
+        else:
+            try:
+                filters['since'] = parse_datetime(since)
+            except ValueError:
+                filters['since'] = None  # well formed but out of range, e.g. month 13
+            if filters['since'] is None:
+                return None, Response({'error': 'Invalid since value'}, status=400)
+        filters['order'] = ('id',)
+
+    limit = request.GET.get('limit')
+    if limit:
+        try:
+            filters['limit'] = min(max(int(limit), 1), MAX_NOTIFICATION_LIMIT)
+        except ValueError:
+            return None, Response({'error': 'Invalid limit'}, status=400)
+        if not since:
+            filters['order'] = ('-created_at', '-id')
+    return filters, None
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_service_provider_notifications(request):
     if not getattr(request.user, 'is_serviceprovider', False):
         return Response({'error': 'Not a service provider'}, status=403)
 
-    notifications = Notification.objects.filter(user=request.user)
-    serializer = NotificationSerializer(notifications, many=True)
-    return Response(serializer.data)  # empty list [] if no notifications
+    filters, error = notification_filters(request)
+    if error:
+        return error
+    return Response(user_notifications(request.user.id, **filters))  # empty list [] if no notifications
 
 
 @api_view(['PUT'])
@@ -492,9 +777,17 @@ def mark_service_provider_notification_read(request, notification_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_notifications(request):
-    notifications = Notification.objects.filter(user=request.user)
-    serializer = NotificationSerializer(notifications, many=True)
-    return Response(serializer.data)
+    filters, error = notification_filters(request)
+    if error:
+        return error
+    return Response(user_notifications(request.user.id, **filters))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_unread_notification_count(request):
+    # One count on the (user, read, created_at) index; enough for badges
+    return Response({'unread': unread_notification_count(request.user.id)})
 
 
 
@@ -505,25 +798,50 @@ def mark_notification_read(request, notification_id):
         notification = Notification.objects.get(id=notification_id, user=request.user)
         notification.read = True
         notification.save()
-        print(notification.user)
-        if notification.user:
-            try:
-                from .models import Booking 
-                booking = Booking.objects.get(email=notification.user)
-                # create a new notification for the booking user
-                Notification.objects.create(
-                    user=booking.user,
-                    message="Booking successfully submitted",
-                    read=False
-                )
-            except Booking.DoesNotExist:
-                pass  # optionally log or handle this case
-
         return Response({'status': 'marked as read'})
     except Notification.DoesNotExist:
         return Response({'error': 'Notification not found'}, status=404)
 
 
+def bulk_mark_read(request):
+    """
+    Mark the caller's notifications as read with a single update(). The body
+    is either {"ids": [1, 2, 3]} or {"up_to": <id>} (everything up to and
+    including that id).
+    """
+    ids = request.data.get('ids')
+    up_to = request.data.get('up_to')
+    notifications = Notification.objects.filter(user=request.user, read=False)
+    try:
+        if ids is not None:
+            if not isinstance(ids, list):
+                raise ValueError
+            notifications = notifications.filter(id__in=[int(i) for i in ids])
+        elif up_to is not None:
+            notifications = notifications.filter(id__lte=int(up_to))
+        else:
+            return Response({'error': 'Provide ids or up_to'}, status=400)
+    except (TypeError, ValueError):
+        return Response({'error': 'Invalid notification ids'}, status=400)
+
+    updated = notifications.update(read=True)
+    return Response({'status': 'marked as read', 'updated': updated})
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def mark_notifications_read(request):
+    return bulk_mark_read(request)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def mark_service_provider_notifications_read(request):
+    if not getattr(request.user, 'is_serviceprovider', False):
+        return Response({'error': 'Not a service provider'}, status=403)
+    return bulk_mark_read(request)
+
+
 
 
 @api_view(['POST'])
@@ -544,16 +862,14 @@ def send_booking_notification(request, booking_id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ask_if_completed(request, booking_id):
-    print("REQUEST: ", request.data)
+    logger.debug('Completion check for booking %s: %s', booking_id, request.data)
     try:
         booking = Booking.objects.get(id=booking_id, user=request.user)
     except Booking.DoesNotExist:
         return Response({'error': 'Booking not found'}, status=404)
 
-    providers = booking.service.provider_links.all()
-    for link in providers:
-        Notification.objects.create(
-            user=link.serviceprovider.user,
-            message=f'User asked if booking {booking.id} for service \"{booking.service.name}\" on {booking.date} at {booking.time_slot} has been completed.'
-        )
+    notify_service_providers(
+        booking.service,
+        f'User asked if booking {booking.id} for service \"{booking.service.name}\" on {booking.date} at {booking.time_slot} has been completed.'
+    )
     return Response({'message': 'Notification sent to service provider(s)'})
@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up. Streaming endpoints are served straight
+# from the event loop; every other request goes to Django.
+from AI.streaming import CHAT_STREAM_PATH, chat_stream  # noqa: E402
+from api.streams import STREAM_PATH, notification_stream, route_streams  # noqa: E402
+
+application = route_streams(django_application, {
+    STREAM_PATH: notification_stream,
+    CHAT_STREAM_PATH: chat_stream,
+})
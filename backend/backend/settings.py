@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -57,7 +59,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-
+    'api.middleware.QueryCountMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -83,15 +85,42 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# The same apps run on MongoDB (djongo), SQLite or PostgreSQL; pick one with
+# DATABASE_PROFILE=mongo|sqlite|postgres. Mongo-only code paths (api/mongo.py,
+# api/repository.py's fast path) switch themselves off on the other two.
+DATABASE_PROFILES = {
+    'mongo': {
         'ENGINE': 'djongo',
-        'NAME': 'HostelFlow',
+        'NAME': os.environ.get('MONGO_DB', 'HostelFlow'),
         'ENFORCE_SCHEMA': False,
         'CLIENT': {
-            'host': 'mongodb://localhost:27017',
+            'host': os.environ.get('MONGO_URL', 'mongodb://localhost:27017'),
         }
-    }
+    },
+    'sqlite': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH', str(BASE_DIR / 'db.sqlite3')),
+    },
+    'postgres': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'hostelflow'),
+        'USER': os.environ.get('POSTGRES_USER', 'hostelflow'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # Keep connections between requests instead of reconnecting each time
+        'CONN_MAX_AGE': 60,
+    },
+}
+
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'mongo')
+if DATABASE_PROFILE not in DATABASE_PROFILES:
+    raise ImproperlyConfigured(
+        f"Unknown DATABASE_PROFILE {DATABASE_PROFILE!r}; choose one of {', '.join(DATABASE_PROFILES)}"
+    )
+
+DATABASES = {
+    'default': DATABASE_PROFILES[DATABASE_PROFILE],
 }
 
 
@@ -139,12 +168,89 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     )
 }
 
+# Access tokens carry the user fields the views read, so safe requests skip the
+# user lookup (api/authentication.py). Claims changed in another process are
+# noticed within this many seconds.
+JWT_CLAIMS_TTL = 60
+
 AUTH_USER_MODEL = 'api.User'
 
+# LLM backend for the booking assistant (AI/llm.py). TIMEOUT bounds each
+# completion in seconds; MAX_CONCURRENCY caps upstream calls per event loop.
+# For offline work set AI_LLM_BACKEND=AI.stub.StubBackend, or run
+# `manage.py llm_stub_server` and point AI_LLM_BASE_URL at it.
+AI_LLM = {
+    'BACKEND': os.environ.get('AI_LLM_BACKEND', 'AI.llm.OpenAIBackend'),
+    'BASE_URL': os.environ.get('AI_LLM_BASE_URL', 'https://openrouter.ai/api/v1'),
+    # No default: OpenAIBackend refuses to start without it (AI/checks.py warns)
+    'API_KEY': os.environ.get('OPEN_ROUTER_API_KEY', ''),
+    'MODEL': 'mistralai/mistral-7b-instruct:free',
+    'TEMPERATURE': 0.3,
+    'TIMEOUT': 20,
+    'MAX_CONCURRENCY': 8,
+    # Per-process cache of LLM answers, keyed on (message, state, date)
+    'CACHE_TTL': 600,
+    'CACHE_MAX_ENTRIES': 1000,
+    # Idle time before a chat's server-side state is dropped
+    'SESSION_TTL': 3600,
+    # Cache alias holding chat state; the per-process default falls back to the
+    # client's previous_state when a turn lands on another worker
+    'SESSION_CACHE': 'default',
+    # Simulated latency/failures for AI.stub.StubBackend
+    'STUB': {'LATENCY_MS': 300, 'JITTER_MS': 100, 'FAILURE_RATE': 0.0},
+}
+
+# Per-request query counts and DB time are logged by api.middleware; the
+# X-DB-Query-Count / X-DB-Time-Ms debug headers are only added when this is on.
+QUERY_COUNT_HEADERS = DEBUG
+
+# Serve the hottest reads (availability, my bookings, notifications) with
+# direct pymongo calls instead of djongo's SQL translation; see api/repository.py.
+# Only takes effect on a djongo database. Verify with `manage.py check_fast_path`.
+MONGO_FAST_PATH = os.environ.get('MONGO_FAST_PATH', '1') != '0'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.queries': {'handlers': ['console'], 'level': 'INFO' if DEBUG else 'WARNING'},
+    },
+}
+
+# Per-process cache for pre-rendered payloads such as the service catalog.
+# Point this at a shared backend (file-based, memcached) to share it between workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hostelflow',
+    }
+}
+
 CORS_ALLOW_HEADERS = list(default_headers) + [
     'Authorization',
 ]
+
+# Provider notifications are written to an outbox by the request and expanded
+# in bulk by a background dispatcher (see api/outbox.py). Set INLINE_WORKER to
+# False when running `manage.py dispatch_notifications --loop` separately.
+NOTIFICATION_OUTBOX = {
+    'INLINE_WORKER': True,
+    'BATCH_SIZE': 500,
+    'POLL_INTERVAL': 5,
+    'CLAIM_TIMEOUT': 300,
+}
+
+# Availability is answered from a per-process occupancy index (api/occupancy.py).
+# Bookings made by other processes show up within POLL_INTERVAL seconds; no
+# entry is served for longer than MAX_AGE seconds without re-reading it.
+OCCUPANCY_INDEX = {
+    'POLL_INTERVAL': 2,
+    'MAX_AGE': 300,
+}
@@ -38,6 +38,7 @@ const Chatbot = () => {
   const [speechEnabled, setSpeechEnabled] = useState(true);
   const [audioLevel, setAudioLevel] = useState(0);
   const [bookingState, setBookingState] = useState<BookingState>({});
+  const [conversationId, setConversationId] = useState<string | null>(null);
   const mediaRecorderRef = useRef<MediaRecorder | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const speechSynthesisRef = useRef<SpeechSynthesisUtterance | null>(null);
@@ -98,12 +99,15 @@ const Chatbot = () => {
         },
         body: JSON.stringify({
           user_message: content,
+          conversation_id: conversationId,
+          // Lets the server rebuild the chat if its copy expired or lives on another worker
           previous_state: bookingState
         })
       });
       const llmResponse = await res.json();
       console.log('AI:', llmResponse);
   
+      if (llmResponse.conversation_id) setConversationId(llmResponse.conversation_id);
       setBookingState(prev => ({ ...prev, ...llmResponse }));
   
       const botMessage: Message = {
@@ -5,7 +5,7 @@ import { DropdownMenu, DropdownMenuContent, DropdownMenuItem, DropdownMenuTrigge
 import { Bell, LogOut, LogIn, User, X } from 'lucide-react';
 import { useAuth } from '@/contexts/AuthContext';
 import { Link } from 'react-router-dom';
-import { studentAPI } from '@/services/api';
+import { notificationsAPI, studentAPI, subscribeToNotifications } from '@/services/api';
 
 interface HeaderProps {
   hideNotifications?: boolean;
@@ -32,6 +32,11 @@ const Header = ({ hideNotifications }: HeaderProps) => {
         }
       };
       fetchNotifications();
+
+      // New notifications arrive over the stream instead of by refetching
+      return subscribeToNotifications((notification) => {
+        setNotifications(prev => [notification, ...prev]);
+      });
     }
   }, [hideNotifications]);
 
@@ -48,6 +53,18 @@ const Header = ({ hideNotifications }: HeaderProps) => {
 
   const unreadCount = notifications.filter(n => !n.read).length;
 
+  // One request for the whole list instead of one per notification
+  const markAllRead = async () => {
+    const ids = notifications.map(n => Number(n.id || n._id)).filter(Number.isFinite);
+    if (ids.length === 0) return;
+    try {
+      await notificationsAPI.markManyAsRead({ up_to: Math.max(...ids) });
+      setNotifications(prev => prev.map(n => ({ ...n, read: true })));
+    } catch (error) {
+      console.error('Failed to mark notifications as read:', error);
+    }
+  };
+
   return (
     <>
       <header className="sticky top-0 z-50 w-full border-b bg-white/80 backdrop-blur-md">
@@ -139,9 +156,16 @@ const Header = ({ hideNotifications }: HeaderProps) => {
         >
           <div className="flex items-center justify-between p-4 border-b">
             <h2 className="text-lg font-semibold">Notifications</h2>
-            <Button variant="ghost" size="icon" onClick={() => setShowSidebar(false)}>
-              <X className="h-5 w-5" />
-            </Button>
+            <div className="flex items-center">
+              {unreadCount > 0 && (
+                <Button variant="ghost" size="sm" onClick={markAllRead}>
+                  Mark all read
+                </Button>
+              )}
+              <Button variant="ghost" size="icon" onClick={() => setShowSidebar(false)}>
+                <X className="h-5 w-5" />
+              </Button>
+            </div>
           </div>
           <div className="p-4 space-y-2 overflow-y-auto">
             {notifications.length === 0 ? (
@@ -1,11 +1,11 @@
-import { useEffect, useState } from 'react';
+import { useState } from 'react';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Calendar } from '@/components/ui/calendar';
 import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle } from '@/components/ui/dialog';
 import { Calendar as CalendarIcon, Clock } from 'lucide-react';
 import { useRescheduleBooking } from '@/hooks/useBookings';
-import { servicesAPI } from '@/services/api';
+import { useMonthAvailability } from '@/hooks/useServices';
 import { format } from 'date-fns';
 
 interface RescheduleModalProps {
@@ -17,7 +17,8 @@ interface RescheduleModalProps {
 const RescheduleModal = ({ isOpen, onClose, booking }: RescheduleModalProps) => {
   const [selectedDate, setSelectedDate] = useState<Date | undefined>();
   const [selectedTimeSlot, setSelectedTimeSlot] = useState<string>('');
-  const [unavailableSlots, setUnavailableSlots] = useState<string[]>([]);
+  const [month, setMonth] = useState<Date>(new Date());
+  const { data: monthSlots = {} } = useMonthAvailability(booking?.service.id, month);
   const rescheduleBooking = useRescheduleBooking();
 
   const timeSlots = [
@@ -25,19 +26,7 @@ const RescheduleModal = ({ isOpen, onClose, booking }: RescheduleModalProps) =>
     '14:00-16:00', '15:00-16:00', '16:00-18:00',
   ];
 
-  useEffect(() => {
-    const fetchUnavailable = async () => {
-      if (!selectedDate || !booking) return;
-      const formattedDate = format(selectedDate, 'yyyy-MM-dd');
-      try {
-        const data = await servicesAPI.getUnavailableSlots(booking.service.id, formattedDate);
-        setUnavailableSlots(data.unavailable_slots || []);
-      } catch (error) {
-        console.error('Failed to fetch unavailable slots', error);
-      }
-    };
-    fetchUnavailable();
-  }, [selectedDate, booking]);
+  const unavailableSlots = selectedDate ? monthSlots[format(selectedDate, 'yyyy-MM-dd')] || [] : [];
 
   const handleReschedule = () => {
     if (!selectedDate || !selectedTimeSlot) return;
@@ -82,6 +71,8 @@ const RescheduleModal = ({ isOpen, onClose, booking }: RescheduleModalProps) =>
               mode="single"
               selected={selectedDate}
               onSelect={setSelectedDate}
+              month={month}
+              onMonthChange={setMonth}
               disabled={isDateDisabled}
               className="rounded-md border"
             />
@@ -18,6 +18,7 @@ export const useCancelBooking = () => {
     mutationFn: bookingsAPI.cancel,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['bookings'] });
+      queryClient.invalidateQueries({ queryKey: ['availability'] });
       toast({
         title: 'Booking cancelled',
         description: 'Your booking has been cancelled successfully.',
@@ -44,6 +45,7 @@ export const useRescheduleBooking = () => {
     }) => bookingsAPI.reschedule(bookingId, newDateTime),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['bookings'] });
+      queryClient.invalidateQueries({ queryKey: ['availability'] });
       toast({
         title: 'Booking rescheduled',
         description: 'Your booking has been rescheduled successfully.',
@@ -1,6 +1,7 @@
 
+import { useEffect, useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { serviceProviderAPI, notificationsAPI } from '@/services/api';
+import { serviceProviderAPI, notificationsAPI, subscribeToNotifications } from '@/services/api';
 import { useToast } from '@/hooks/use-toast';
 
 export const useServiceProviderBookings = () => {
@@ -11,10 +12,23 @@ export const useServiceProviderBookings = () => {
 };
 
 export const useServiceProviderNotifications = () => {
+  const queryClient = useQueryClient();
+  const [streaming, setStreaming] = useState(true);
+
+  useEffect(() => {
+    return subscribeToNotifications(
+      (notification) => {
+        queryClient.setQueryData(['service-provider', 'notifications'], (old: any[] = []) => [...old, notification]);
+      },
+      () => setStreaming(false),
+    );
+  }, [queryClient]);
+
   return useQuery({
     queryKey: ['service-provider', 'notifications'],
     queryFn: serviceProviderAPI.getNotifications,
-    refetchInterval: 30000, // Refetch every 30 seconds
+    // Only poll when the notification stream is unavailable
+    refetchInterval: streaming ? false : 30000,
   });
 };
 
@@ -1,5 +1,5 @@
-
 import { useQuery } from '@tanstack/react-query';
+import { endOfMonth, format, max, startOfDay, startOfMonth } from 'date-fns';
 import { servicesAPI } from '@/services/api';
 
 export const useServices = () => {
@@ -8,3 +8,20 @@ export const useServices = () => {
     queryFn: servicesAPI.getAll,
   });
 };
+
+// Unavailable slots for every remaining day of `month`, keyed by yyyy-MM-dd,
+// loaded with one matrix request instead of one availability request per date
+export const useMonthAvailability = (serviceId: string | undefined, month: Date) => {
+  const today = startOfDay(new Date());
+  const start = format(max([startOfMonth(month), today]), 'yyyy-MM-dd');
+  const end = format(endOfMonth(month), 'yyyy-MM-dd');
+
+  return useQuery({
+    queryKey: ['availability', serviceId, start, end],
+    queryFn: async (): Promise<Record<string, string[]>> => {
+      const data = await servicesAPI.getAvailabilityMatrix([serviceId!], start, end);
+      return data.unavailable_slots[String(serviceId)] || {};
+    },
+    enabled: !!serviceId && endOfMonth(month) >= today,
+  });
+};
@@ -11,6 +11,7 @@ import { Textarea } from '@/components/ui/textarea';
 import { ArrowLeft, Clock, Calendar as CalendarIcon, CheckCircle } from 'lucide-react';
 import { useToast } from '@/hooks/use-toast';
 import { servicesAPI } from '@/services/api';
+import { useMonthAvailability } from '@/hooks/useServices';
 
 const BookingForm = () => {
   const { serviceId } = useParams();
@@ -20,30 +21,20 @@ const BookingForm = () => {
   const [selectedTimeSlot, setSelectedTimeSlot] = useState<string>('');
   const [specialInstructions, setSpecialInstructions] = useState('');
   const [isBooking, setIsBooking] = useState(false);
-  const [unavailableSlots, setUnavailableSlots] = useState<string[]>([]);
-  const [loadingSlots, setLoadingSlots] = useState(false);
+  const [month, setMonth] = useState<Date>(new Date());
+  const { data: monthSlots = {}, isError, refetch: refetchSlots } = useMonthAvailability(serviceId, month);
 
   useEffect(() => {
-    const fetchUnavailableSlots = async () => {
-      if (!selectedDate) return;
-      setLoadingSlots(true);
-      try {
-        const formattedDate = format(selectedDate, 'yyyy-MM-dd');
-        const data = await servicesAPI.getUnavailableSlots(serviceId!, formattedDate);
-        setUnavailableSlots(data.unavailable_slots);
-      } catch (error) {
-        toast({
-          title: 'Error',
-          description: 'Failed to load unavailable time slots.',
-          variant: 'destructive'
-        });
-      } finally {
-        setLoadingSlots(false);
-      }
-    };
-  
-    fetchUnavailableSlots();
-  }, [selectedDate, serviceId, toast]);
+    if (isError) {
+      toast({
+        title: 'Error',
+        description: 'Failed to load unavailable time slots.',
+        variant: 'destructive'
+      });
+    }
+  }, [isError, toast]);
+
+  const unavailableSlots = selectedDate ? monthSlots[format(selectedDate, 'yyyy-MM-dd')] || [] : [];
 
   const allTimeSlots = [
     '08:00-10:00', '10:00-12:00', '12:00-14:00', '14:00-16:00', 
@@ -82,6 +73,8 @@ const BookingForm = () => {
 
       navigate('/');
     } catch (error) {
+      // The slot may have been taken since the month was loaded
+      refetchSlots();
       toast({
         title: 'Booking Failed',
         description: 'There was an error booking your service. Please try again.',
@@ -137,10 +130,13 @@ const BookingForm = () => {
                   mode="single"
                   selected={selectedDate}
                   onSelect={setSelectedDate}
+                  month={month}
+                  onMonthChange={setMonth}
                   disabled={(date) => {
                     const today = new Date();
                     today.setHours(0, 0, 0, 0);
-                    return date < today;
+                    const taken = monthSlots[format(date, 'yyyy-MM-dd')] || [];
+                    return date < today || taken.length >= allTimeSlots.length;
                   }}
                   className="rounded-md border pointer-events-auto"
                 />
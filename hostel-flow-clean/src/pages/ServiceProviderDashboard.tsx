@@ -8,7 +8,8 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@
 import { useToast } from '@/hooks/use-toast';
 import { useAuth } from '@/contexts/AuthContext';
 import { serviceProviderAPI, notificationsAPI } from '@/services/api';
-import { Bell, Calendar, CheckCircle, Clock, User, Wrench } from 'lucide-react';
+import { Bell, Calendar, CheckCircle, ChevronLeft, ChevronRight, Clock, User, Wrench } from 'lucide-react';
+import { addDays, format, parseISO } from 'date-fns';
 import Header from '@/components/Header';
 import ProtectedRoute from '@/components/ProtectedRoute';
 
@@ -34,12 +35,29 @@ interface Notification {
   created_at: string;
 }
 
+interface CalendarCell {
+  id: number;
+  service_name: string;
+  student: string;
+  room_number: string;
+  status: string;
+}
+
+interface ProviderCalendar {
+  week_start: string;
+  week_end: string;
+  time_slots: string[];
+  days: { date: string; slots: Record<string, CalendarCell[]> }[];
+}
+
 const ServiceProviderDashboard = () => {
   const [bookings, setBookings] = useState<Booking[]>([]);
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [selectedNotification, setSelectedNotification] = useState<Notification | null>(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
+  const [calendarWeek, setCalendarWeek] = useState(format(new Date(), 'yyyy-MM-dd'));
+  const [calendar, setCalendar] = useState<ProviderCalendar | null>(null);
   
   const [stats, setStats] = useState({
     pending: 0,
@@ -54,6 +72,25 @@ const ServiceProviderDashboard = () => {
     loadData();
   }, []);
 
+  useEffect(() => {
+    loadCalendar(calendarWeek);
+  }, [calendarWeek]);
+
+  // One week of bookings as a grid, instead of bucketing the whole history here
+  const loadCalendar = async (week: string) => {
+    try {
+      setCalendar(await serviceProviderAPI.getCalendar(week));
+    } catch (error) {
+      console.error('Failed to load calendar:', error);
+    }
+  };
+
+  const shiftWeek = (days: number) => {
+    if (calendar) {
+      setCalendarWeek(format(addDays(parseISO(calendar.week_start), days), 'yyyy-MM-dd'));
+    }
+  };
+
   const loadData = async () => {
     setIsLoading(true);
     try {
@@ -106,6 +143,7 @@ const ServiceProviderDashboard = () => {
       });
       
       loadData(); // Refresh data
+      loadCalendar(calendarWeek);
     } catch (error) {
       toast({
         title: 'Error',
@@ -126,6 +164,17 @@ const ServiceProviderDashboard = () => {
     }
   };
 
+  const markAllNotificationsRead = async () => {
+    const ids = notifications.map(n => Number(n.id)).filter(Number.isFinite);
+    if (ids.length === 0) return;
+    try {
+      await serviceProviderAPI.markNotificationsRead({ up_to: Math.max(...ids) });
+      setNotifications(prev => prev.map(n => ({ ...n, read: true })));
+    } catch (error) {
+      console.error('Failed to mark notifications as read:', error);
+    }
+  };
+
   const getStatusColor = (status: string) => {
     switch (status) {
       case 'confirmed':
@@ -218,8 +267,9 @@ const ServiceProviderDashboard = () => {
           </div>
 
           <Tabs defaultValue="bookings" className="space-y-6">
-            <TabsList className="grid w-full grid-cols-2">
+            <TabsList className="grid w-full grid-cols-3">
               <TabsTrigger value="bookings">My Bookings</TabsTrigger>
+              <TabsTrigger value="calendar">Calendar</TabsTrigger>
               <TabsTrigger value="notifications" className="relative">
                 Notifications
                 {notifications.filter(n => !n.read).length > 0 && (
@@ -293,12 +343,73 @@ const ServiceProviderDashboard = () => {
               </Card>
             </TabsContent>
 
+            <TabsContent value="calendar">
+              <Card className="bg-white/80 backdrop-blur-sm">
+                <CardHeader>
+                  <CardTitle className="flex items-center justify-between">
+                    <span className="flex items-center gap-2">
+                      <Calendar className="h-5 w-5" />
+                      {calendar
+                        ? `${formatDate(calendar.week_start)} - ${formatDate(calendar.week_end)}`
+                        : 'This week'}
+                    </span>
+                    <span className="flex space-x-2">
+                      <Button size="sm" variant="outline" onClick={() => shiftWeek(-7)}>
+                        <ChevronLeft className="h-4 w-4" />
+                      </Button>
+                      <Button size="sm" variant="outline" onClick={() => shiftWeek(7)}>
+                        <ChevronRight className="h-4 w-4" />
+                      </Button>
+                    </span>
+                  </CardTitle>
+                </CardHeader>
+                <CardContent>
+                  {calendar && (
+                    <Table>
+                      <TableHeader>
+                        <TableRow>
+                          <TableHead>Time</TableHead>
+                          {calendar.days.map((day) => (
+                            <TableHead key={day.date}>{format(parseISO(day.date), 'EEE d')}</TableHead>
+                          ))}
+                        </TableRow>
+                      </TableHeader>
+                      <TableBody>
+                        {calendar.time_slots.map((slot) => (
+                          <TableRow key={slot}>
+                            <TableCell className="font-medium whitespace-nowrap">{slot}</TableCell>
+                            {calendar.days.map((day) => (
+                              <TableCell key={day.date} className="align-top">
+                                {day.slots[slot].map((cell) => (
+                                  <div key={cell.id} className="text-xs mb-1">
+                                    <Badge className={getStatusColor(cell.status)}>{cell.service_name}</Badge>
+                                    <div className="text-gray-600">{cell.student} · {cell.room_number}</div>
+                                  </div>
+                                ))}
+                              </TableCell>
+                            ))}
+                          </TableRow>
+                        ))}
+                      </TableBody>
+                    </Table>
+                  )}
+                </CardContent>
+              </Card>
+            </TabsContent>
+
             <TabsContent value="notifications">
               <Card className="bg-white/80 backdrop-blur-sm">
                 <CardHeader>
-                  <CardTitle className="flex items-center gap-2">
-                    <Bell className="h-5 w-5" />
-                    Notifications
+                  <CardTitle className="flex items-center justify-between">
+                    <span className="flex items-center gap-2">
+                      <Bell className="h-5 w-5" />
+                      Notifications
+                    </span>
+                    {notifications.some(n => !n.read) && (
+                      <Button size="sm" variant="outline" onClick={markAllNotificationsRead}>
+                        Mark all read
+                      </Button>
+                    )}
                   </CardTitle>
                 </CardHeader>
                 <CardContent>
@@ -63,7 +63,10 @@ export const servicesAPI = {
   }),
 
   getUnavailableSlots: (serviceId: string, date: string) =>
-    apiRequest(`/bookings/availability?service_id=${serviceId}&date=${date}`)
+    apiRequest(`/bookings/availability?service_id=${serviceId}&date=${date}`),
+
+  getAvailabilityMatrix: (serviceIds: string[], start: string, end: string) =>
+    apiRequest(`/bookings/availability/matrix?service_ids=${serviceIds.join(',')}&start=${start}&end=${end}`)
 };
 
 export const studentAPI = {
@@ -140,6 +143,10 @@ export const serviceProviderAPI = {
   getProfile: () => apiRequest('/service-provider/profile'),
   
   getAssignedBookings: () => apiRequest('/service-provider/bookings'),
+
+  // Bookings for one week as a date x time slot grid; `week` is any YYYY-MM-DD in it
+  getCalendar: (week?: string) =>
+    apiRequest(`/service-provider/calendar${week ? `?week=${encodeURIComponent(week)}` : ''}`),
   
   updateBookingStatus: (bookingId: string, status: 'in_progress' | 'completed') =>
     apiRequest(`/service-provider/bookings/${bookingId}/status`, {
@@ -153,6 +160,12 @@ export const serviceProviderAPI = {
     apiRequest(`/service-provider/notifications/${notificationId}/read`, {
       method: 'PUT',
     }),
+
+  markNotificationsRead: (payload: { ids: string[] } | { up_to: string | number }) =>
+    apiRequest('/service-provider/notifications/read', {
+      method: 'PUT',
+      body: JSON.stringify(payload),
+    }),
   
   sendCompletionNotification: (bookingId: string, message: string) =>
     apiRequest(`/service-provider/bookings/${bookingId}/notify-completion`, {
@@ -164,11 +177,22 @@ export const serviceProviderAPI = {
 // Notifications API calls  
 export const notificationsAPI = {
   getUserNotifications: () => apiRequest('/notifications/user'),
+
+  getNotificationsSince: (since: string | number, limit = 50) =>
+    apiRequest(`/notifications/user?since=${encodeURIComponent(String(since))}&limit=${limit}`),
+
+  getUnreadCount: () => apiRequest('/notifications/unread-count'),
   
   markAsRead: (notificationId: string) =>
     apiRequest(`/notifications/${notificationId}/read`, {
       method: 'PUT',
     }),
+
+  markManyAsRead: (payload: { ids: string[] } | { up_to: string | number }) =>
+    apiRequest('/notifications/read', {
+      method: 'PUT',
+      body: JSON.stringify(payload),
+    }),
   
   sendBookingNotification: (bookingId: string) =>
     apiRequest(`/notifications/booking/${bookingId}`, {
@@ -176,6 +200,31 @@ export const notificationsAPI = {
     }),
 };
 
+// Live notifications over server-sent events (served by the ASGI app).
+// EventSource resends the last event id on reconnect, so nothing is replayed.
+export const subscribeToNotifications = (
+  onNotification: (notification: any) => void,
+  onUnavailable?: () => void,
+) => {
+  const token = getAuthToken();
+  if (!token) {
+    onUnavailable?.();
+    return () => {};
+  }
+
+  const source = new EventSource(`${API_BASE_URL}/notifications/stream?token=${encodeURIComponent(token)}`);
+  source.addEventListener('notification', (event) => {
+    onNotification(JSON.parse((event as MessageEvent).data));
+  });
+  source.onerror = () => {
+    // A closed source means the server has no stream endpoint (e.g. runserver)
+    if (source.readyState === EventSource.CLOSED) {
+      onUnavailable?.();
+    }
+  };
+  return () => source.close();
+};
+
 // Stats API calls
 export const statsAPI = {
   getDashboard: () => apiRequest('/stats/dashboard'),